@@ -1 +1,2 @@
-from .workflows import router
\ No newline at end of file
+from .workflows import router
+from .rankings import router as rankings_router
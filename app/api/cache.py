@@ -0,0 +1,59 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+class ResponseCache:
+    """
+    In-process LRU cache of serialized API responses.
+
+    Every entry is tied to the data version it was built from. As soon as a
+    harvest bumps the version, the whole cache is dropped instead of waiting
+    for entries to expire.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version: int):
+        """Returns (body, etag, headers) for key at the given data version, or None."""
+        with self._lock:
+            if version != self.version:
+                self._entries.clear()
+                self.version = version
+                return None
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, version: int, body: bytes, headers: dict = None):
+        """Stores a serialized body and returns its (body, etag, headers) entry."""
+        etag = f'"{version}-{hashlib.sha1(body).hexdigest()[:16]}"'
+        entry = (body, etag, headers or {})
+        with self._lock:
+            if version != self.version:
+                # A newer harvest landed while this body was being built
+                if self.version is not None and version < self.version:
+                    return entry
+                self._entries.clear()
+                self.version = version
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.version = None
+
+def etag_matches(if_none_match, etag: str) -> bool:
+    """Evaluates an If-None-Match header against the current ETag."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.database.db import get_db
+from app.models.ranking import WorkflowRanking
+
+router = APIRouter()
+
+@router.get("/rankings")
+def read_rankings(
+    top: int = Query(10, ge=1, le=500, description="Number of keywords to return"),
+    country: Optional[str] = Query(None, description="Region (US, IN) or GLOBAL for the cross-region ranking"),
+    db: Session = Depends(get_db)
+):
+    """
+    Cross-platform popularity ranking of the seed keywords.
+    Served from the table materialized at the end of every harvest job.
+    """
+    country = country.upper() if country else "GLOBAL"
+    rows = (
+        db.query(WorkflowRanking)
+        .filter(WorkflowRanking.country == country)
+        .order_by(WorkflowRanking.rank)
+        .limit(top)
+        .all()
+    )
+    return [r.to_dict() for r in rows]
@@ -1,35 +1,357 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from typing import List, Optional
-from app.database.db import get_db
-from app.models.workflow import Workflow
+from app.api.cache import ResponseCache, etag_matches
+from app.database.db import AsyncSessionLocal, get_async_db
+from app.database.search_index import match_expression, search_statement
+from app.database.versioning import get_data_version_async
+from app.models.platform_metrics import metric_expression, metric_source
+from app.models.snapshot import SNAPSHOT_MODELS
+from app.models.workflow import METRIC_FIELDS, Workflow, api_shape, projection_columns
+from app.services.history_service import HISTORY_BUCKETS, history_statement
+from app.utils.config import Config
+from app.utils.metrics import API_CACHE_LOOKUPS, API_SERIALIZE_SECONDS
+import base64
+import csv
 import datetime
+import io
+import json
+import math
+import orjson
 
 router = APIRouter()
 
+# Serialized responses, dropped whenever a harvest job commits new data
+response_cache = ResponseCache(maxsize=Config.API_CACHE_SIZE)
+
+# Columns a page can be ordered by. 'id' pages oldest first, metrics highest first.
+SORTABLE_COLUMNS = (
+    "id", "views", "likes", "comments", "like_to_view_ratio", "comment_to_view_ratio",
+    "replies", "contributors", "interest_score", "monthly_volume", "growth_pct",
+)
+
+# Range of a SQLite INTEGER; cursor positions outside it cannot be bound
+SQLITE_INT_MIN, SQLITE_INT_MAX = -2**63, 2**63 - 1
+
+# Every metric name exposed by any platform shape
+KNOWN_FIELDS = {name for shape in METRIC_FIELDS.values() for name in shape}
+
+# Rows fetched from SQLite (and flushed to the client) per export chunk
+EXPORT_CHUNK_SIZE = 1000
+
+# CSV export columns: identity fields followed by every metric, in shape order
+CSV_COLUMNS = ["workflow", "platform", "country"] + list(dict.fromkeys(
+    name for shape in METRIC_FIELDS.values() for name in shape
+))
+
+def _encode_cursor(order_by: str, value, row_id: int) -> str:
+    raw = json.dumps([order_by, value, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def _is_sql_number(value) -> bool:
+    """True for a finite int/float SQLite can bind (bool is not a number here)."""
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return SQLITE_INT_MIN <= value <= SQLITE_INT_MAX
+    return isinstance(value, float) and math.isfinite(value)
+
+def _decode_cursor(cursor: str, order_by: str):
+    """Returns the (value, id) position stored in a cursor issued for `order_by`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_order, value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Malformed cursor.")
+    # The position is bound straight into the keyset WHERE clause: anything but a
+    # number (or null for `id`, whose position is the row id alone) is rejected here
+    value_ok = _is_sql_number(value) or (order_by == "id" and value is None)
+    if not (value_ok and isinstance(row_id, int) and _is_sql_number(row_id)):
+        raise HTTPException(status_code=400, detail="Malformed cursor.")
+    if cursor_order != order_by:
+        raise HTTPException(status_code=400, detail="Cursor was issued for a different order_by.")
+    return value, row_id
+
+def _parse_page_request(order_by: str, fields: Optional[str], cursor: Optional[str]):
+    """Validates the paging parameters; returns (field_set, cursor position)."""
+    if order_by not in SORTABLE_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"order_by must be one of: {', '.join(SORTABLE_COLUMNS)}")
+    field_set = None
+    if fields:
+        field_set = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = field_set - KNOWN_FIELDS
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    position = _decode_cursor(cursor, order_by) if cursor else None
+    return field_set, position
+
+def _page_statement(platform, country, limit, position, order_by: str, field_set, dedupe: bool = False):
+    """SELECT for one page; works with both sync and async sessions."""
+    if field_set is None:
+        # Full shape: the JSON pre-serialized at write time is all we need
+        columns = ["id", order_by, "api_json"]
+    else:
+        # SELECT only the columns the requested metrics need
+        columns = ["id", "workflow_name", "platform", "country", order_by]
+        columns += projection_columns(platform, field_set)
+    columns = list(dict.fromkeys(columns))
+    # Only the platform tables holding a requested metric are joined to the dimension
+    source, metrics = metric_source(platform, columns)
+
+    def column(name):
+        if name in Workflow.__table__.columns:
+            return getattr(Workflow, name)
+        return metric_expression(metrics, name).label(name)
+
+    # Plain column rows: no ORM objects are built on the read path
+    stmt = select(*(column(c) for c in columns)).select_from(source)
+
+    # Apply Filters
+    if platform:
+        stmt = stmt.where(Workflow.platform == platform)
+    if country:
+        stmt = stmt.where(Workflow.country == country)
+    if dedupe:
+        # First row of every title cluster among the filtered rows
+        member = aliased(Workflow)
+        representatives = select(func.min(member.id)).group_by(func.coalesce(member.cluster_id, member.id))
+        if platform:
+            representatives = representatives.where(member.platform == platform)
+        if country:
+            representatives = representatives.where(member.country == country)
+        stmt = stmt.where(Workflow.id.in_(representatives))
+
+    # Keyset pagination: resume strictly after the last row of the previous page
+    sort_column = Workflow.id if order_by == "id" else metric_expression(metrics, order_by)
+    if order_by == "id":
+        stmt = stmt.order_by(Workflow.id)
+        if position:
+            stmt = stmt.where(Workflow.id > position[1])
+    else:
+        stmt = stmt.where(sort_column.isnot(None)).order_by(sort_column.desc(), Workflow.id)
+        if position:
+            value, row_id = position
+            stmt = stmt.where(or_(
+                sort_column < value,
+                and_(sort_column == value, Workflow.id > row_id),
+            ))
+
+    if limit:
+        # One extra row tells us whether another page follows
+        stmt = stmt.limit(limit + 1)
+    return stmt
+
+def _render_page(results, limit, order_by: str, field_set):
+    """Serializes a page of rows; returns (body, headers)."""
+    headers = {}
+    if limit and len(results) > limit:
+        results = results[:limit]
+        last = results[-1]
+        headers["X-Next-Cursor"] = _encode_cursor(order_by, getattr(last, order_by), last.id)
+
+    if field_set is None:
+        body = b"[" + b",".join(r.api_json.encode("utf-8") for r in results) + b"]"
+    else:
+        # api_shape() handles the 'Big Shape' filtering, as Workflow.to_dict() does
+        body = orjson.dumps([
+            api_shape(r.workflow_name, r.platform, r.country, r._mapping.get, field_set)
+            for r in results
+        ])
+    return body, headers
+
+def _conditional_response(entry, if_none_match: Optional[str]) -> Response:
+    """Turns a cache entry into a 200, or a 304 when the client's ETag still matches."""
+    body, etag, extra_headers = entry
+    headers = {"ETag": etag, "Cache-Control": "no-cache", **extra_headers}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 @router.get("/workflows", response_model=None)
-def read_workflows(
+async def read_workflows(
     platform: Optional[str] = Query(None, description="Filter by platform (youtube, forum, google)"),
     country: Optional[str] = Query(None, description="Filter by country (US, IN, GLOBAL)"),
-    db: Session = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size (all rows when omitted)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's X-Next-Cursor header"),
+    order_by: str = Query("id", description=f"Sort column: {', '.join(SORTABLE_COLUMNS)}"),
+    fields: Optional[str] = Query(None, description="Comma-separated popularity metrics to return (e.g. views,likes)"),
+    dedupe: bool = Query(False, description="Return only the first row of every near-duplicate title cluster"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Returns a list of workflows. 
     The shape of 'popularity_metrics' changes dynamically based on the platform.
+
+    Pagination is keyset based: when more rows follow a page, the response
+    carries an X-Next-Cursor header to pass back as `cursor`. Ordering by a
+    metric skips rows where that metric is empty.
+    Responses carry an ETag; clients sending it back in If-None-Match get a
+    304 until the next harvest changes the data.
+    With `dedupe`, titles that only differ by emoji, years or tutorial
+    clutter collapse into their cluster's first row.
     """
-    query = db.query(Workflow)
-    
-    # Apply Filters
+    platform = platform.lower() if platform else None
+    # Use upper for US/IN, but keep 'GLOBAL' consistent
+    country = country.upper() if country else None
+    field_set, position = _parse_page_request(order_by, fields, cursor)
+
+    version = await get_data_version_async(db)
+    cache_key = (platform, country, limit, cursor, order_by, frozenset(field_set) if field_set else None, dedupe)
+    entry = response_cache.get(cache_key, version)
+    API_CACHE_LOOKUPS.inc(result="miss" if entry is None else "hit")
+
+    if entry is None:
+        stmt = _page_statement(platform, country, limit, position, order_by, field_set, dedupe)
+        results = (await db.execute(stmt)).all()
+        with API_SERIALIZE_SECONDS.time(handler="read_workflows"):
+            body, headers = _render_page(results, limit, order_by, field_set)
+        entry = response_cache.put(cache_key, version, body, headers)
+
+    return _conditional_response(entry, if_none_match)
+
+async def _iter_export_rows(platform: Optional[str], country: Optional[str], serialized: bool = False):
+    """
+    Yields workflow dicts in chunks, keeping only one chunk in memory.
+    With `serialized`, chunks hold the pre-serialized JSON strings instead.
+    """
+    # The generator owns its session: it outlives the request handler
+    async with AsyncSessionLocal() as db:
+        stmt = select(Workflow.api_json).order_by(Workflow.id)
+        if platform:
+            stmt = stmt.where(Workflow.platform == platform)
+        if country:
+            stmt = stmt.where(Workflow.country == country)
+
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_CHUNK_SIZE))
+        async for partition in result.scalars().partitions():
+            # Dicts are parsed back from the stored JSON: no metric tables to join
+            yield partition if serialized else [orjson.loads(row) for row in partition]
+
+async def _ndjson_stream(chunks):
+    async for chunk in chunks:
+        yield "".join(row + "\n" for row in chunk)
+
+async def _csv_stream(chunks):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    async for chunk in chunks:
+        for row in chunk:
+            writer.writerow({
+                "workflow": row["workflow"],
+                "platform": row["platform"],
+                "country": row["country"],
+                **row["popularity_metrics"],
+            })
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header-only exports still need to be flushed
+    if buffer.tell():
+        yield buffer.getvalue()
+
+@router.get("/workflows/export", response_model=None)
+async def export_workflows(
+    format: str = Query("ndjson", description="Export format (ndjson, csv)"),
+    platform: Optional[str] = Query(None, description="Filter by platform (youtube, forum, google)"),
+    country: Optional[str] = Query(None, description="Filter by country (US, IN, GLOBAL)"),
+):
+    """
+    Streams the whole workflow table for warehouse exports.
+    Rows use the same platform-specific shapes as /workflows, and memory
+    stays flat however large the table is.
+    """
+    chunks = _iter_export_rows(
+        platform.lower() if platform else None,
+        country.upper() if country else None,
+        serialized=format == "ndjson",
+    )
+    today = datetime.date.today().isoformat()
+    if format == "ndjson":
+        return StreamingResponse(
+            _ndjson_stream(chunks),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": f'attachment; filename="workflows-{today}.ndjson"'},
+        )
+    if format == "csv":
+        return StreamingResponse(
+            _csv_stream(chunks),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="workflows-{today}.csv"'},
+        )
+    raise HTTPException(status_code=400, detail="format must be one of: ndjson, csv")
+
+@router.get("/workflows/search", response_model=None)
+async def search_workflows(
+    q: str = Query(..., min_length=1, description="Words to look for in workflow titles (prefixes match)"),
+    platform: Optional[str] = Query(None, description="Filter by platform (youtube, forum, google)"),
+    country: Optional[str] = Query(None, description="Filter by country (US, IN, GLOBAL)"),
+    limit: int = Query(20, ge=1, le=200, description="Maximum number of results"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Full-text search over the harvested titles, best BM25 matches first.
+    Every word has to match the start of a title word ("wha crm" finds
+    "WhatsApp CRM"). Results use the same shapes as /workflows.
+    """
+    match = match_expression(q)
+    if match is None:
+        return Response(content=b"[]", media_type="application/json")
+
+    params = {"match": match, "limit": limit}
     if platform:
-        query = query.filter(Workflow.platform == platform.lower())
+        params["platform"] = platform.lower()
     if country:
-        # Use upper for US/IN, but keep 'GLOBAL' consistent
-        query = query.filter(Workflow.country == country.upper())
-    
-    results = query.all()
-    
-    # to_dict() in the model handles the 'Big Shape' filtering
-    return [w.to_dict() for w in results]
+        params["country"] = country.upper()
+    rows = (await db.execute(search_statement(platform, country), params)).all()
+    body = b"[" + b",".join(r.api_json.encode("utf-8") for r in rows) + b"]"
+    return Response(content=body, media_type="application/json")
+
+def _naive_utc(value: Optional[datetime.datetime]):
+    """Snapshots are stored as naive UTC; align timezone-aware query bounds."""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return value
+
+@router.get("/workflows/{workflow_id}/history", response_model=None)
+async def read_workflow_history(
+    workflow_id: int,
+    since: Optional[datetime.datetime] = Query(None, description="Start of the range (ISO 8601, inclusive)"),
+    until: Optional[datetime.datetime] = Query(None, description="End of the range (ISO 8601, exclusive)"),
+    bucket: str = Query("day", description=f"Downsampling bucket: {', '.join(HISTORY_BUCKETS)}"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Metric history of one workflow, downsampled to one point per bucket.
+    Counters (views, likes, ...) report their highest value in the bucket,
+    scores (interest, growth) their average. Snapshots older than
+    SNAPSHOT_RETENTION_DAYS only exist as weekly aggregates.
+    """
+    if bucket not in HISTORY_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"bucket must be one of: {', '.join(HISTORY_BUCKETS)}")
+    workflow = await db.get(Workflow, workflow_id)
+    if workflow is None:
+        raise HTTPException(status_code=404, detail="Workflow not found.")
+    if workflow.platform not in SNAPSHOT_MODELS:
+        raise HTTPException(status_code=404, detail=f"No history is kept for platform '{workflow.platform}'.")
+
+    stmt = history_statement(workflow.platform, workflow_id, _naive_utc(since), _naive_utc(until), bucket)
+    rows = (await db.execute(stmt)).mappings().all()
+    return {
+        "id": workflow.id,
+        "workflow": workflow.workflow_name,
+        "platform": workflow.platform,
+        "country": workflow.country,
+        "bucket": bucket,
+        "points": [
+            {name: round(value, 4) if isinstance(value, float) else value for name, value in row.items()}
+            for row in rows
+        ],
+    }
 
 @router.get("/health")
 def health_check():
@@ -38,4 +360,4 @@ def health_check():
         "status": "online", 
         "timestamp": datetime.datetime.utcnow().isoformat(),
         "version": "1.0.0"
-    }
\ No newline at end of file
+    }
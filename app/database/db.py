@@ -1,7 +1,10 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 import os
 from dotenv import load_dotenv
+from app.utils.config import Config
 
 load_dotenv()
 
@@ -11,11 +14,59 @@ if not os.path.exists('./data'):
 
 # Updated to use data_base.db for better project identification
 SQLALCHEMY_DATABASE_URL = "sqlite:///./data_base.db"
+# Same file through aiosqlite, for the async API handlers
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///./data_base.db"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False} # Required for SQLite with FastAPI
-)
+# PRAGMAs run on every new connection, per Config.SQLITE_PROFILE
+STORAGE_PROFILES = {
+    # SQLite defaults: rollback journal, a committing writer blocks every reader
+    "default": {},
+    # Write-ahead log: readers see the last commit while a harvest writes
+    "wal": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",  # fsync at checkpoints only; safe in WAL mode
+        "busy_timeout": Config.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": Config.SQLITE_MMAP_MB * 1024 * 1024,
+        "cache_size": -Config.SQLITE_CACHE_MB * 1024,  # negative means KiB
+    },
+}
+
+def apply_storage_profile(engine, profile: str = Config.SQLITE_PROFILE):
+    """Registers a connect hook that runs the profile's PRAGMAs (sync or async engines)."""
+    if profile not in STORAGE_PROFILES:
+        raise ValueError(f"Unknown SQLITE_PROFILE '{profile}', expected one of: {', '.join(STORAGE_PROFILES)}")
+    pragmas = STORAGE_PROFILES[profile]
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
+def create_sqlite_engine(url: str, profile: str = Config.SQLITE_PROFILE):
+    """Sync engine with the storage profile and the API connection pool."""
+    return apply_storage_profile(create_engine(
+        url,
+        connect_args={"check_same_thread": False},  # Required for SQLite with FastAPI
+        pool_size=Config.SQLITE_POOL_SIZE,
+        max_overflow=Config.SQLITE_MAX_OVERFLOW,
+    ), profile)
+
+def create_async_sqlite_engine(url: str, profile: str = Config.SQLITE_PROFILE):
+    """aiosqlite counterpart of create_sqlite_engine."""
+    return apply_storage_profile(create_async_engine(
+        url,
+        # aiosqlite defaults to NullPool, which reopens the file (and reruns the PRAGMAs) per request
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=Config.SQLITE_POOL_SIZE,
+        max_overflow=Config.SQLITE_MAX_OVERFLOW,
+    ), profile)
+
+engine = create_sqlite_engine(SQLALCHEMY_DATABASE_URL)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -28,4 +79,17 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async_engine = create_async_sqlite_engine(ASYNC_SQLALCHEMY_DATABASE_URL)
+
+# expire_on_commit=False: objects stay readable after commit without lazy IO
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+
+async def get_async_db():
+    """
+    Async counterpart of get_db for `async def` endpoints.
+    Queries run on the event loop instead of taking a threadpool slot.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
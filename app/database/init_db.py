@@ -1,5 +1,5 @@
 from app.database.db import engine
-from app.models.workflow import Base
+from app.database.migrations import upgrade_schema
 import os
 
 def init_db():
@@ -19,7 +19,7 @@ def init_db():
         from app.models.workflow import Workflow
         
         print("📝 Registering models...")
-        Base.metadata.create_all(bind=engine)
+        upgrade_schema(engine)
         
         print(f"✅ Database tables created successfully at: {os.path.abspath(db_path)}")
     except Exception as e:
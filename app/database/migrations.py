@@ -0,0 +1,124 @@
+from sqlalchemy import inspect, select, text, update
+from sqlalchemy.orm import Session
+from app.database.search_index import sync_search_index
+from app.models import Base, Workflow
+from app.models.platform_metrics import METRIC_MODELS, METRIC_TABLE_COLUMNS, metric_source
+from app.models.snapshot import SNAPSHOT_COLUMNS, SNAPSHOT_MODELS
+from app.models.workflow import serialize_api_row
+
+def _add_missing_columns(engine):
+    """ALTER TABLE ... ADD COLUMN for model columns an older database lacks."""
+    inspector = inspect(engine)
+    added = []
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                    added.append((table.name, column.name))
+    return added
+
+# Every metric column; the wide workflows table of older versions stored them all
+ALL_METRIC_COLUMNS = tuple(dict.fromkeys(c for columns in METRIC_TABLE_COLUMNS.values() for c in columns))
+
+def _split_wide_table(engine) -> bool:
+    """
+    Moves the metrics of the old single wide workflows table into the
+    per-platform tables, then drops them from workflows (SQLite >= 3.35
+    rewrites the table, so its rows shrink to the dimension columns).
+    """
+    existing = {c["name"] for c in inspect(engine).get_columns("workflows")}
+    legacy = [c for c in ALL_METRIC_COLUMNS if c in existing]
+    if not legacy:
+        return False
+    with engine.begin() as conn:
+        for platform, model in METRIC_MODELS.items():
+            columns = ", ".join(c for c in METRIC_TABLE_COLUMNS[platform] if c in existing)
+            conn.execute(text(f"""
+                INSERT OR IGNORE INTO {model.__tablename__} (workflow_id, {columns})
+                SELECT id, {columns} FROM workflows WHERE platform = :platform
+            """), {"platform": platform})
+        for column in legacy:
+            conn.execute(text(f"ALTER TABLE workflows DROP COLUMN {column}"))
+    return True
+
+def _backfill_snapshots(engine, platforms):
+    """Seeds freshly created snapshot tables with the current metrics."""
+    with engine.begin() as conn:
+        for platform in platforms:
+            columns = ", ".join(SNAPSHOT_COLUMNS[platform])
+            selected = ", ".join(f"m.{c}" for c in SNAPSHOT_COLUMNS[platform])
+            conn.execute(text(f"""
+                INSERT INTO {SNAPSHOT_MODELS[platform].__tablename__} (workflow_id, captured_at, {columns})
+                SELECT m.workflow_id, COALESCE(w.last_updated, CURRENT_TIMESTAMP), {selected}
+                FROM {METRIC_MODELS[platform].__tablename__} m JOIN workflows w ON w.id = m.workflow_id
+            """))
+
+def _backfill_api_json(engine, chunk_size: int = 1000):
+    """Serializes rows written before api_json existed (or outside the upsert)."""
+    source, metrics = metric_source(columns=ALL_METRIC_COLUMNS)
+    stmt = (
+        select(Workflow.id, Workflow.workflow_name, Workflow.platform, Workflow.country,
+               *(expression.label(column) for column, expression in metrics.items()))
+        .select_from(source).where(Workflow.api_json.is_(None)).limit(chunk_size)
+    )
+    with Session(engine) as db:
+        while True:
+            rows = db.execute(stmt).all()
+            if not rows:
+                break
+            db.execute(update(Workflow), [
+                {"id": row.id, "api_json": serialize_api_row(row._mapping)}
+                for row in rows
+            ])
+            db.commit()
+
+def upgrade_schema(engine):
+    """
+    Creates missing tables and brings databases created by older versions
+    of the project up to date. Safe to run on every start.
+    """
+    existing_tables = set(inspect(engine).get_table_names())
+    Base.metadata.create_all(bind=engine)
+
+    added = _add_missing_columns(engine)
+    if ("workflows", "keyword") in added:
+        with engine.begin() as conn:
+            # Trends rows are stored under their seed keyword already
+            conn.execute(text("UPDATE workflows SET keyword = workflow_name WHERE platform = 'google'"))
+
+    indexes = {ix["name"] for ix in inspect(engine).get_indexes("workflows")}
+    if "ux_workflows_natural_key" not in indexes:
+        with engine.begin() as conn:
+            # The unique index can only be built once duplicates are gone.
+            # Keep the most recently inserted row of every (name, platform, country).
+            conn.execute(text("""
+                DELETE FROM workflows
+                WHERE id NOT IN (
+                    SELECT MAX(id) FROM workflows
+                    GROUP BY workflow_name, platform, country
+                )
+            """))
+
+    # Databases from before the split keep their metrics in the wide workflows table
+    _split_wide_table(engine)
+
+    # History starts with the metrics the database already holds
+    _backfill_snapshots(engine, [
+        platform for platform, model in SNAPSHOT_MODELS.items()
+        if model.__tablename__ not in existing_tables
+    ])
+
+    # Rows stored before api_json existed get their pre-serialized shape
+    _backfill_api_json(engine)
+
+    # FTS5 title index, filled for rows that predate it
+    sync_search_index(engine)
+
+    # create_all skips tables that already exist, so indexes added to the
+    # models later have to be created explicitly
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
@@ -0,0 +1,91 @@
+import re
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+from app.utils.helpers import clean_title
+
+# FTS5 index over the normalized titles; rowid = workflows.id.
+# prefix='2 3' keeps short prefix queries ("sl*", "wha*") off the full term scan.
+SEARCH_TABLE = "workflow_search"
+
+CREATE_SEARCH_TABLE = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        title,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+"""
+
+def index_titles(db: Session, rows):
+    """
+    Adds (workflow_id, workflow_name) pairs missing from the index, inside
+    the caller's transaction. The name is part of the natural key, so an
+    indexed title never changes.
+    """
+    titles = dict(rows)
+    if not titles:
+        return
+    indexed = db.execute(
+        text(f"SELECT rowid FROM {SEARCH_TABLE} WHERE rowid IN :ids").bindparams(bindparam("ids", expanding=True)),
+        {"ids": list(titles)},
+    ).scalars().all()
+    for workflow_id in indexed:
+        del titles[workflow_id]
+    if titles:
+        db.execute(
+            text(f"INSERT INTO {SEARCH_TABLE} (rowid, title) VALUES (:id, :title)"),
+            [{"id": workflow_id, "title": clean_title(name)} for workflow_id, name in titles.items()],
+        )
+
+def sync_search_index(engine, chunk_size: int = 5000):
+    """Creates the FTS table and indexes every workflow it does not cover yet."""
+    with engine.begin() as conn:
+        conn.execute(text(CREATE_SEARCH_TABLE))
+        # Rows removed from workflows (e.g. by the duplicate cleanup)
+        conn.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid NOT IN (SELECT id FROM workflows)"))
+        indexed = conn.execute(text(f"SELECT COUNT(*) FROM {SEARCH_TABLE}")).scalar()
+        total = conn.execute(text("SELECT COUNT(*) FROM workflows")).scalar()
+    if indexed == total:
+        return
+
+    # Walk the table in id order; index_titles skips what is already there
+    with Session(engine) as db:
+        last_id = 0
+        while True:
+            rows = db.execute(text(
+                "SELECT id, workflow_name FROM workflows WHERE id > :last_id ORDER BY id LIMIT :n"
+            ), {"last_id": last_id, "n": chunk_size}).all()
+            if not rows:
+                break
+            index_titles(db, rows)
+            db.commit()
+            last_id = rows[-1].id
+
+def match_expression(query: str):
+    """
+    FTS5 MATCH string for a user query: every word must appear, as a prefix.
+    The query goes through clean_title like the indexed titles; returns
+    None when nothing searchable is left.
+    """
+    words = re.findall(r"\w+", clean_title(query).lower()) if query.strip() else []
+    if not words:
+        return None
+    return " AND ".join(f'"{word}"*' for word in words)
+
+def search_statement(platform=None, country=None):
+    """
+    Best BM25 matches first; binds :match and :limit.
+    Selects id and the pre-serialized api_json of the matching workflows.
+    """
+    filters = ""
+    if platform:
+        filters += " AND w.platform = :platform"
+    if country:
+        filters += " AND w.country = :country"
+    return text(f"""
+        SELECT w.id, w.api_json
+        FROM {SEARCH_TABLE}
+        JOIN workflows AS w ON w.id = {SEARCH_TABLE}.rowid
+        WHERE {SEARCH_TABLE} MATCH :match{filters}
+        ORDER BY bm25({SEARCH_TABLE}), w.id
+        LIMIT :limit
+    """)
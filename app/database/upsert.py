@@ -0,0 +1,120 @@
+import datetime
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app.models.platform_metrics import METRIC_MODELS, METRIC_TABLE_COLUMNS
+from app.models.snapshot import SNAPSHOT_COLUMNS, SNAPSHOT_MODELS
+from app.models.workflow import Workflow, serialize_api_row
+from app.utils.metrics import DB_ROWS_WRITTEN, DB_UPSERT_SECONDS
+from app.database.search_index import index_titles
+from app.database.versioning import bump_data_version
+
+# Natural key of a harvested record, backed by the ux_workflows_natural_key index
+NATURAL_KEY = ("workflow_name", "platform", "country")
+
+# Every non-key column a service dict may carry
+METRIC_COLUMNS = (
+    "keyword",
+    "views", "likes", "comments", "like_to_view_ratio", "comment_to_view_ratio",
+    "replies", "contributors", "interest_score", "monthly_volume", "growth_pct",
+)
+
+# Columns written to the workflows dimension; the metrics go to the platform tables
+DIMENSION_COLUMNS = NATURAL_KEY + ("keyword", "last_updated", "api_json")
+
+def bulk_upsert_workflows(db: Session, rows) -> dict:
+    """
+    Writes a batch of unified service dicts inside one transaction: one
+    INSERT ... ON CONFLICT DO UPDATE for the workflow dimension, then one
+    per platform for its current-metrics table.
+
+    Rows sharing a natural key are collapsed (the last one wins). Every
+    written row also gets a snapshot appended to its platform's history table,
+    and new titles are added to the full-text search index.
+    Returns {"inserted": n, "updated": m}.
+    """
+    batch = {}
+    now = datetime.datetime.utcnow()
+    for data in rows:
+        record = {col: data.get(col) for col in NATURAL_KEY + METRIC_COLUMNS}
+        record["last_updated"] = now
+        record["api_json"] = serialize_api_row(record)
+        batch[tuple(record[col] for col in NATURAL_KEY)] = record
+
+    if not batch:
+        return {"inserted": 0, "updated": 0}
+
+    stmt = insert(Workflow)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(NATURAL_KEY),
+        set_={col: stmt.excluded[col] for col in DIMENSION_COLUMNS if col not in NATURAL_KEY},
+    ).returning(Workflow.id, *(getattr(Workflow, col) for col in NATURAL_KEY))
+
+    with DB_UPSERT_SECONDS.time():
+        try:
+            _lock_for_write(db)
+            # Read under the write lock: rows other writers commit can't land in between
+            max_id = db.execute(select(func.max(Workflow.id))).scalar() or 0
+            dimensions = [{col: record[col] for col in DIMENSION_COLUMNS} for record in batch.values()]
+            written = db.execute(stmt, dimensions).all()
+            ids_by_key = {tuple(row[1:]): row[0] for row in written}
+            _write_metrics(db, ids_by_key, batch)
+            _append_snapshots(db, ids_by_key, batch, now)
+            # New titles become searchable with the same commit
+            index_titles(db, [(row[0], row[1]) for row in written])
+            # Invalidate cached API responses as soon as this batch commits
+            bump_data_version(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+    # New rows get ids above the previous maximum; conflicting ones keep theirs
+    inserted = sum(1 for row in written if row[0] > max_id)
+    DB_ROWS_WRITTEN.inc(inserted, result="inserted")
+    DB_ROWS_WRITTEN.inc(len(batch) - inserted, result="updated")
+    return {"inserted": inserted, "updated": len(batch) - inserted}
+
+def _lock_for_write(db: Session):
+    """
+    Takes SQLite's write lock now (BEGIN IMMEDIATE) rather than at the first
+    INSERT. pysqlite issues no BEGIN before a SELECT, so a read would
+    otherwise run outside the transaction.
+    """
+    connection = db.connection()
+    if not connection.connection.dbapi_connection.in_transaction:
+        # Waits for other writers up to the connection's busy timeout
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+def _write_metrics(db: Session, ids_by_key: dict, batch: dict):
+    """Upserts every written record's counters into its platform's current-metrics table."""
+    metrics = {}
+    for key, record in batch.items():
+        columns = METRIC_TABLE_COLUMNS.get(record["platform"])
+        if columns is None or key not in ids_by_key:
+            continue
+        metrics.setdefault(record["platform"], []).append({
+            "workflow_id": ids_by_key[key],
+            **{col: record[col] for col in columns},
+        })
+    for platform, rows in metrics.items():
+        stmt = insert(METRIC_MODELS[platform])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["workflow_id"],
+            set_={col: stmt.excluded[col] for col in METRIC_TABLE_COLUMNS[platform]},
+        ), rows)
+
+def _append_snapshots(db: Session, ids_by_key: dict, batch: dict, captured_at):
+    """Inserts one history row per written record into its platform's snapshot table."""
+    snapshots = {}
+    for key, record in batch.items():
+        columns = SNAPSHOT_COLUMNS.get(record["platform"])
+        if columns is None or key not in ids_by_key:
+            continue
+        snapshots.setdefault(record["platform"], []).append({
+            "workflow_id": ids_by_key[key],
+            "captured_at": captured_at,
+            **{col: record[col] for col in columns},
+        })
+    for platform, rows in snapshots.items():
+        db.execute(insert(SNAPSHOT_MODELS[platform]), rows)
@@ -0,0 +1,24 @@
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.data_version import DataVersion
+
+def bump_data_version(db: Session):
+    """
+    Increments the shared data version inside the caller's transaction,
+    so the bump becomes visible together with the harvested rows.
+    """
+    db.execute(text(
+        "INSERT INTO data_version (id, version) VALUES (1, 1) "
+        "ON CONFLICT (id) DO UPDATE SET version = version + 1"
+    ))
+
+def get_data_version(db: Session) -> int:
+    """Current data version (0 until the first harvest commits)."""
+    version = db.execute(select(DataVersion.version).where(DataVersion.id == 1)).scalar()
+    return version or 0
+
+async def get_data_version_async(db: AsyncSession) -> int:
+    """get_data_version for an AsyncSession."""
+    version = (await db.execute(select(DataVersion.version).where(DataVersion.id == 1))).scalar()
+    return version or 0
@@ -1,15 +1,17 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import uvicorn
+from fastapi.responses import JSONResponse, PlainTextResponse
 import datetime
 import logging
+import time
 from contextlib import asynccontextmanager
 
 # Internal imports
 from app.api.workflows import router as workflow_router
-from app.database.db import engine
-from app.models.workflow import Base
+from app.api.rankings import router as rankings_router
+from app.database.db import async_engine, engine
+from app.database.migrations import upgrade_schema
+from app.utils.metrics import API_REQUEST_SECONDS, REGISTRY
 
 # Set up logging to track ingestion and API performance
 logging.basicConfig(level=logging.INFO)
@@ -23,8 +25,9 @@ async def lifespan(app: FastAPI):
     """
     logger.info("🚀 System booting up. Initializing n8n_popularity.db...")
     # This creates the 'Big Unified Shape' tables if they don't exist
-    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
     yield
+    await async_engine.dispose()
     logger.info("🛑 System shutting down.")
 
 # 1. Initialize the FastAPI instance
@@ -43,9 +46,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browser clients read the paging cursor and the revalidation tag
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
-# 3. Global Exception Handler
+# 3. Request Metrics
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    """Per-route request latency for /metrics (route templates keep label cardinality low)."""
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    API_REQUEST_SECONDS.observe(
+        time.perf_counter() - start,
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=response.status_code,
+    )
+    return response
+
+# 4. Global Exception Handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logger.error(f"❌ Unhandled Error: {exc}")
@@ -54,10 +74,16 @@ async def global_exception_handler(request: Request, exc: Exception):
         content={"message": "An internal error occurred while processing the workflow data."},
     )
 
-# 4. Register Routes
+# 5. Register Routes
 app.include_router(workflow_router, prefix="/api", tags=["Workflows"])
+app.include_router(rankings_router, prefix="/api", tags=["Rankings"])
+
+# 6. Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(REGISTRY.render_prometheus(), media_type="text/plain; version=0.0.4")
 
-# 5. Root Landing Page
+# 7. Root Landing Page
 @app.get("/")
 async def root():
     return {
@@ -71,10 +97,13 @@ async def root():
         "query_examples": {
             "all": "/api/workflows",
             "trending_google": "/api/workflows?platform=google",
-            "india_segment": "/api/workflows?country=IN"
+            "india_segment": "/api/workflows?country=IN",
+            "top_keywords": "/api/rankings?top=10"
         }
     }
 
 if __name__ == "__main__":
+    # Only needed when run directly; uvicorn workers import app.main without it
+    import uvicorn
     # Standard production settings
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
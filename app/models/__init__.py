@@ -1 +1,9 @@
-from .workflow import Workflow, Base
\ No newline at end of file
+from .workflow import Workflow, Base
+from .platform_metrics import YouTubeMetrics, ForumMetrics, TrendsMetrics
+from .data_version import DataVersion
+from .ranking import WorkflowRanking
+from .trend_point import TrendPoint
+from .harvest_run import HarvestRun, HarvestUnit
+from .quota_usage import QuotaUsage
+from .snapshot import YouTubeSnapshot, ForumSnapshot, TrendsSnapshot
+from .title_band import TitleBand
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer
+from app.models.workflow import Base
+
+class DataVersion(Base):
+    """
+    Single-row counter bumped by every harvest commit.
+    API caches compare against it to detect stale responses.
+    """
+    __tablename__ = "data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
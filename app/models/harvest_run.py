@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from app.models.workflow import Base
+import datetime
+
+class HarvestRun(Base):
+    """One execution of a harvest job (youtube, forum or google)."""
+    __tablename__ = "harvest_runs"
+    __table_args__ = (
+        Index("ix_harvest_runs_source_started", "source", "started_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    source = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="running")  # running, completed, failed
+    started_at = Column(DateTime, default=datetime.datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+class HarvestUnit(Base):
+    """
+    Checkpoint of one keyword/region inside a run.
+    Lets a restarted job skip the units it already completed.
+    """
+    __tablename__ = "harvest_units"
+    __table_args__ = (
+        Index("ux_harvest_units_run_unit", "run_id", "keyword", "region", unique=True),
+        # Freshness lookups: latest completed unit per source/keyword/region
+        Index("ix_harvest_units_freshness", "source", "keyword", "region", "status", "updated_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    run_id = Column(Integer, ForeignKey("harvest_runs.id"), nullable=False)
+    source = Column(String, nullable=False)
+    keyword = Column(String, nullable=False)
+    region = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending, done, failed, skipped
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow)
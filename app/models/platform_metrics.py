@@ -0,0 +1,74 @@
+from sqlalchemy import Column, Integer, Float, ForeignKey, func, null
+from app.models.workflow import Base, Workflow
+
+# Current metrics, one narrow table per platform.
+# `workflows` is the shared dimension (name, platform, country, keyword);
+# each of its rows has exactly one row in its platform's table, keyed by
+# workflow_id, holding only the counters that platform reports.
+
+class YouTubeMetrics(Base):
+    __tablename__ = "youtube_metrics"
+
+    workflow_id = Column(Integer, ForeignKey("workflows.id", ondelete="CASCADE"), primary_key=True)
+    views = Column(Integer)
+    likes = Column(Integer)
+    comments = Column(Integer)
+    like_to_view_ratio = Column(Float)
+    comment_to_view_ratio = Column(Float)
+
+class ForumMetrics(Base):
+    __tablename__ = "forum_metrics"
+
+    workflow_id = Column(Integer, ForeignKey("workflows.id", ondelete="CASCADE"), primary_key=True)
+    views = Column(Integer)
+    likes = Column(Integer)
+    replies = Column(Integer)
+    contributors = Column(Integer)
+
+class TrendsMetrics(Base):
+    __tablename__ = "trends_metrics"
+
+    workflow_id = Column(Integer, ForeignKey("workflows.id", ondelete="CASCADE"), primary_key=True)
+    interest_score = Column(Integer)
+    monthly_volume = Column(Integer)
+    growth_pct = Column(Float)
+
+# platform -> current-metrics model, and the metric columns it stores
+METRIC_MODELS = {
+    "youtube": YouTubeMetrics,
+    "forum": ForumMetrics,
+    "google": TrendsMetrics,
+}
+METRIC_TABLE_COLUMNS = {
+    platform: tuple(c.name for c in model.__table__.columns if c.name != "workflow_id")
+    for platform, model in METRIC_MODELS.items()
+}
+
+def metric_source(platform=None, columns=()):
+    """
+    FROM clause for reading metrics next to the workflow dimension.
+    Returns (from_clause, {column: expression}): only the platform tables
+    that store one of `columns` are joined (just `platform`'s when given),
+    and a metric kept by several platforms (views, likes) coalesces them.
+    Columns no joined table stores are absent from the mapping.
+    """
+    source = Workflow.__table__
+    found = {}
+    for name, model in METRIC_MODELS.items():
+        if platform and name != platform:
+            continue
+        stored = [c for c in METRIC_TABLE_COLUMNS[name] if c in columns]
+        if not stored:
+            continue
+        source = source.outerjoin(model, model.workflow_id == Workflow.id)
+        for column in stored:
+            found.setdefault(column, []).append(getattr(model, column))
+    expressions = {
+        column: parts[0] if len(parts) == 1 else func.coalesce(*parts)
+        for column, parts in found.items()
+    }
+    return source, expressions
+
+def metric_expression(expressions: dict, column: str):
+    """The expression of a metric column, or NULL when no joined table stores it."""
+    return expressions.get(column, null())
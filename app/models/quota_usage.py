@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, Date
+from app.models.workflow import Base
+
+class QuotaUsage(Base):
+    """
+    Quota units a source spent on one UTC day.
+    Kept in the database so a restarted scheduler resumes the day's budget.
+    """
+    __tablename__ = "quota_usage"
+
+    source = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    units = Column(Integer, nullable=False, default=0)
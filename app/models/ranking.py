@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
+from app.models.workflow import Base
+import datetime
+
+class WorkflowRanking(Base):
+    """
+    Materialized cross-platform popularity ranking.
+    Rebuilt at the end of every harvest job so /api/rankings is a single
+    indexed range read.
+    """
+    __tablename__ = "workflow_rankings"
+    __table_args__ = (
+        Index("ix_workflow_rankings_country_rank", "country", "rank"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    keyword = Column(String, nullable=False)
+    country = Column(String, nullable=False)  # US, IN, ... or GLOBAL (mean over regions)
+    rank = Column(Integer, nullable=False)
+
+    # Composite score and its per-platform components, all in [0, 1]
+    score = Column(Float, nullable=False)
+    youtube_score = Column(Float, nullable=False)
+    forum_score = Column(Float, nullable=False)
+    trends_score = Column(Float, nullable=False)
+
+    computed_at = Column(DateTime, default=datetime.datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            "rank": self.rank,
+            "keyword": self.keyword,
+            "country": self.country,
+            "score": round(self.score, 4),
+            "components": {
+                "youtube": round(self.youtube_score, 4),
+                "forum": round(self.forum_score, 4),
+                "google": round(self.trends_score, 4),
+            },
+            "computed_at": self.computed_at.isoformat() if self.computed_at else None,
+        }
@@ -0,0 +1,58 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, Index
+from app.models.workflow import Base
+
+# Append-only metric history, one narrow table per platform.
+# The current values live in the platform_metrics tables; every harvest
+# also appends the platform's raw counters here, keyed by workflows.id
+# (the workflow/platform/country/keyword dimension).
+
+class YouTubeSnapshot(Base):
+    __tablename__ = "youtube_snapshots"
+    __table_args__ = (
+        Index("ix_youtube_snapshots_workflow_captured", "workflow_id", "captured_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    workflow_id = Column(Integer, ForeignKey("workflows.id", ondelete="CASCADE"), nullable=False)
+    captured_at = Column(DateTime, nullable=False)
+    views = Column(Integer)
+    likes = Column(Integer)
+    comments = Column(Integer)
+
+class ForumSnapshot(Base):
+    __tablename__ = "forum_snapshots"
+    __table_args__ = (
+        Index("ix_forum_snapshots_workflow_captured", "workflow_id", "captured_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    workflow_id = Column(Integer, ForeignKey("workflows.id", ondelete="CASCADE"), nullable=False)
+    captured_at = Column(DateTime, nullable=False)
+    views = Column(Integer)
+    likes = Column(Integer)
+    replies = Column(Integer)
+    contributors = Column(Integer)
+
+class TrendsSnapshot(Base):
+    __tablename__ = "trends_snapshots"
+    __table_args__ = (
+        Index("ix_trends_snapshots_workflow_captured", "workflow_id", "captured_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    workflow_id = Column(Integer, ForeignKey("workflows.id", ondelete="CASCADE"), nullable=False)
+    captured_at = Column(DateTime, nullable=False)
+    interest_score = Column(Integer)
+    monthly_volume = Column(Integer)
+    growth_pct = Column(Float)
+
+# platform -> snapshot model, and the metric columns copied into it
+SNAPSHOT_MODELS = {
+    "youtube": YouTubeSnapshot,
+    "forum": ForumSnapshot,
+    "google": TrendsSnapshot,
+}
+SNAPSHOT_COLUMNS = {
+    platform: tuple(c.name for c in model.__table__.columns if c.name not in ("id", "workflow_id", "captured_at"))
+    for platform, model in SNAPSHOT_MODELS.items()
+}
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from app.models.workflow import Base
+
+class TitleBand(Base):
+    """
+    One MinHash LSH band of a normalized workflow title.
+    Titles sharing any (band, bucket) pair are near-duplicate candidates,
+    so new rows are matched without comparing them to every stored title.
+    """
+    __tablename__ = "title_bands"
+    __table_args__ = (
+        Index("ix_title_bands_band_bucket", "band", "bucket"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    workflow_id = Column(Integer, ForeignKey("workflows.id", ondelete="CASCADE"), nullable=False)
+    band = Column(Integer, nullable=False)
+    bucket = Column(Integer, nullable=False)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Float, Date, Index
+from app.models.workflow import Base
+
+class TrendPoint(Base):
+    """
+    One day of Google Trends interest for a keyword/region.
+    Values are kept on the scale of the first download of the series;
+    later incremental fetches are rescaled onto it (see trend_store).
+    """
+    __tablename__ = "trend_points"
+    __table_args__ = (
+        Index("ux_trend_points_series_day", "keyword", "country", "day", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    keyword = Column(String, nullable=False)
+    country = Column(String, nullable=False)
+    day = Column(Date, nullable=False)
+    value = Column(Float, nullable=False)
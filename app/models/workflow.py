@@ -1,65 +1,126 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index, Text
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 import datetime
+import orjson
 
 Base = declarative_base()
 
+def _raw(value):
+    return value
+
+def _ratio(value):
+    return round(value, 4) if value else 0.0
+
+def _percentage(value):
+    return f"{value}%" if value else "0%"
+
+# API metric name -> (column, formatter) for every platform shape
+METRIC_FIELDS = {
+    "youtube": {
+        "views": ("views", _raw),
+        "likes": ("likes", _raw),
+        "comments": ("comments", _raw),
+        "like_to_view_ratio": ("like_to_view_ratio", _ratio),
+        "comment_to_view_ratio": ("comment_to_view_ratio", _ratio),
+    },
+    "forum": {
+        "replies": ("replies", _raw),
+        "likes": ("likes", _raw),
+        "unique_contributors": ("contributors", _raw),
+        "thread_views": ("views", _raw),
+    },
+    "google": {
+        "relative_search_interest": ("interest_score", _raw),
+        "keyword_search_volume": ("monthly_volume", _raw),
+        "change_over_60_days": ("growth_pct", _percentage),
+    },
+}
+
+def projection_columns(platform=None, fields=None):
+    """
+    Names of the metric columns needed to render the requested shape(s).
+    Without a platform every shape is considered.
+    """
+    shapes = [METRIC_FIELDS.get(platform, {})] if platform else METRIC_FIELDS.values()
+    return sorted({
+        column
+        for shape in shapes
+        for name, (column, _) in shape.items()
+        if fields is None or name in fields
+    })
+
+def api_shape(workflow_name, platform, country, value_of, fields=None):
+    """
+    Unified API shape with platform-specific metric visibility.
+    `value_of(column)` reads a raw column value; `fields` optionally
+    restricts 'popularity_metrics' to the given metric names.
+    """
+    # Only the columns behind the requested metrics are touched, so rows
+    # loaded with a column projection never trigger lazy loads.
+    shape = METRIC_FIELDS.get(platform.lower(), {})
+    return {
+        "workflow": workflow_name,
+        "platform": platform,
+        "country": country,
+        "popularity_metrics": {
+            name: format_value(value_of(column))
+            for name, (column, format_value) in shape.items()
+            if fields is None or name in fields
+        },
+    }
+
+def serialize_api_row(record: dict) -> str:
+    """Full API JSON of a unified service dict, stored in Workflow.api_json at write time."""
+    return orjson.dumps(api_shape(
+        record["workflow_name"], record["platform"], record["country"], record.get
+    )).decode("utf-8")
+
 class Workflow(Base):
+    """
+    Workflow/keyword dimension: one row per harvested (title, platform,
+    country). The metrics live in the narrow per-platform tables of
+    app.models.platform_metrics.
+    """
     __tablename__ = "workflows"
+    __table_args__ = (
+        # Natural key used by the harvest jobs' bulk upsert
+        Index("ux_workflows_natural_key", "workflow_name", "platform", "country", unique=True),
+        # Serves the platform/country filters of the API in id (cursor) order
+        Index("ix_workflows_platform_country", "platform", "country", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     workflow_name = Column(String, index=True)
     platform = Column(String)  # youtube, forum, google
     country = Column(String)   # US, IN, GLOBAL
+    keyword = Column(String, index=True)  # Seed keyword the record was harvested for
+    cluster_id = Column(Integer, index=True)  # id of the first row with a near-duplicate title (see dedup_service)
 
-    # --- Unified Storage (Big Shape) ---
-    # YouTube metrics
-    views = Column(Integer, nullable=True)          
-    likes = Column(Integer, nullable=True)          
-    comments = Column(Integer, nullable=True)       
-    like_to_view_ratio = Column(Float, nullable=True)
-    comment_to_view_ratio = Column(Float, nullable=True)
+    last_updated = Column(DateTime, default=datetime.datetime.utcnow)
 
-    # Forum specific metrics
-    replies = Column(Integer, nullable=True)        
-    contributors = Column(Integer, nullable=True)   
+    # Pre-serialized to_dict() output, rebuilt by every upsert so the API
+    # can stream it without constructing ORM objects
+    api_json = Column(Text, nullable=True)
 
-    # Google Trends specific metrics
-    interest_score = Column(Integer, nullable=True) 
-    monthly_volume = Column(Integer, nullable=True) 
-    growth_pct = Column(Float, nullable=True)       
-    
-    last_updated = Column(DateTime, default=datetime.datetime.utcnow)
+    # Current metrics of each platform; only the one matching `platform` is set
+    youtube_metrics = relationship("YouTubeMetrics", uselist=False, viewonly=True)
+    forum_metrics = relationship("ForumMetrics", uselist=False, viewonly=True)
+    trends_metrics = relationship("TrendsMetrics", uselist=False, viewonly=True)
 
-    def to_dict(self):
-        """Unified API shape with platform-specific metric visibility."""
-        output = {
-            "workflow": self.workflow_name,
-            "platform": self.platform,
-            "country": self.country,
-            "popularity_metrics": {}
-        }
+    @property
+    def metrics(self):
+        """This workflow's row of its platform's metrics table (None if missing)."""
+        attribute = {"youtube": "youtube_metrics", "forum": "forum_metrics", "google": "trends_metrics"}.get(self.platform)
+        return getattr(self, attribute) if attribute else None
 
-        if self.platform.lower() == "youtube":
-            output["popularity_metrics"] = {
-                "views": self.views,
-                "likes": self.likes,
-                "comments": self.comments,
-                "like_to_view_ratio": round(self.like_to_view_ratio, 4) if self.like_to_view_ratio else 0.0,
-                "comment_to_view_ratio": round(self.comment_to_view_ratio, 4) if self.comment_to_view_ratio else 0.0
-            }
-        elif self.platform.lower() == "forum":
-            output["popularity_metrics"] = {
-                "replies": self.replies,
-                "likes": self.likes,
-                "unique_contributors": self.contributors,
-                "thread_views": self.views
-            }
-        elif self.platform.lower() == "google":
-            output["popularity_metrics"] = {
-                "relative_search_interest": self.interest_score,
-                "keyword_search_volume": self.monthly_volume,
-                "change_over_60_days": f"{self.growth_pct}%" if self.growth_pct else "0%"
-            }
-        
-        return output
\ No newline at end of file
+    def to_dict(self, fields=None):
+        """
+        Unified API shape with platform-specific metric visibility.
+        `fields` optionally restricts 'popularity_metrics' to the given metric names.
+        """
+        metrics = self.metrics
+        return api_shape(
+            self.workflow_name, self.platform, self.country,
+            lambda column: getattr(metrics, column, None), fields,
+        )
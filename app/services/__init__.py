@@ -1,3 +1,16 @@
-from .youtube_service import YouTubeService
-from .forum_service import ForumService
-from .trends_service import TrendsService
\ No newline at end of file
+import importlib
+
+# Services are imported on first access, so importing any app.services module
+# (e.g. from the API) does not load googleapiclient, pytrends or pandas
+_SERVICES = {
+    "YouTubeService": ".youtube_service",
+    "ForumService": ".forum_service",
+    "TrendsService": ".trends_service",
+}
+
+__all__ = list(_SERVICES)
+
+def __getattr__(name):
+    if name in _SERVICES:
+        return getattr(importlib.import_module(_SERVICES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from app.models.platform_metrics import metric_expression, metric_source
+from app.models.workflow import Workflow
+
+# Metric columns pulled into the analytics frame
+FRAME_COLUMNS = (
+    "id", "workflow_name", "platform", "country", "keyword",
+    "views", "likes", "comments", "replies", "contributors",
+    "interest_score", "growth_pct",
+)
+
+# Per-platform metrics that get z-scores and percentile ranks
+SCORED_METRICS = {
+    "youtube": ["views", "likes", "comments", "like_to_view_ratio", "comment_to_view_ratio"],
+    "forum": ["views", "likes", "replies", "contributors"],
+    "google": ["interest_score", "growth_pct"],
+}
+
+def load_workflow_frame(db) -> pd.DataFrame:
+    """Loads every harvested row into one DataFrame (a single SELECT over the metric tables)."""
+    source, metrics = metric_source(columns=FRAME_COLUMNS)
+    stmt = select(*(
+        getattr(Workflow, c) if c in Workflow.__table__.columns else metric_expression(metrics, c).label(c)
+        for c in FRAME_COLUMNS
+    )).select_from(source)
+    return pd.DataFrame(db.execute(stmt).all(), columns=list(FRAME_COLUMNS))
+
+def engagement_ratios(numerator, views) -> np.ndarray:
+    """Vectorized calculate_engagement: numerator / views, 0.0 where views is 0 or missing."""
+    numerator = np.asarray(numerator, dtype=float)
+    views = np.asarray(views, dtype=float)
+    valid = np.nan_to_num(views) > 0
+    ratios = np.divide(np.nan_to_num(numerator), views, out=np.zeros_like(views), where=valid)
+    return np.round(ratios, 4)
+
+def growth_pct_edges(values, edge: int = 10) -> np.ndarray:
+    """
+    Vectorized calculate_growth_pct over a (series x days) matrix:
+    mean of the last `edge` days against the mean of the first `edge` days.
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    if values.shape[1] < edge:
+        return np.zeros(values.shape[0])
+    return _growth(values[:, -edge:].mean(axis=1), values[:, :edge].mean(axis=1))
+
+def growth_pct_windows(values, window: int = 30) -> np.ndarray:
+    """
+    Vectorized TrendsService growth over a (series x days) matrix:
+    mean of the last `window` days against the `window` days before them
+    (or the first `window` days when the series is shorter than 2 windows).
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    recent = values[:, -window:].mean(axis=1)
+    if values.shape[1] >= 2 * window:
+        previous = values[:, -2 * window:-window].mean(axis=1)
+    else:
+        previous = values[:, :window].mean(axis=1)
+    return _growth(recent, previous)
+
+def _growth(recent: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    growth = np.divide(recent - previous, previous, out=np.zeros_like(recent), where=previous > 0) * 100
+    # From zero to something counts as a 100% breakout
+    growth = np.where((previous <= 0) & (recent > 0), 100.0, growth)
+    return np.round(growth, 2)
+
+def analyze_workflows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Computes engagement ratios, z-scores and percentile ranks for every row
+    in one vectorized pass. Statistics are taken within each
+    (platform, country) group so YouTube views are never compared with
+    forum views.
+
+    Adds `<metric>_z` and `<metric>_pct` columns for every SCORED_METRICS entry.
+    """
+    df = df.copy()
+    df["like_to_view_ratio"] = engagement_ratios(df["likes"], df["views"])
+    df["comment_to_view_ratio"] = engagement_ratios(df["comments"], df["views"])
+
+    for metric in sorted({m for metrics in SCORED_METRICS.values() for m in metrics}):
+        values = df[metric].astype(float)
+        grouped = values.groupby([df["platform"], df["country"]], sort=False)
+        mean = grouped.transform("mean")
+        std = grouped.transform("std", ddof=0)
+        df[f"{metric}_z"] = ((values - mean) / std.replace(0, np.nan)).fillna(0.0)
+        df[f"{metric}_pct"] = grouped.rank(pct=True).fillna(0.0)
+
+        # Metrics belong to specific platforms; blank them elsewhere
+        owners = [p for p, metrics in SCORED_METRICS.items() if metric in metrics]
+        foreign = ~df["platform"].isin(owners)
+        df.loc[foreign, [f"{metric}_z", f"{metric}_pct"]] = np.nan
+    return df
@@ -0,0 +1,123 @@
+import asyncio
+from urllib.parse import urlparse
+from app.services.forum_service import MAX_TOPICS_PER_QUERY, cached_topic, store_topic, topic_to_unified
+from app.utils.config import Config
+from app.utils.http_cache import HttpCache
+from app.utils.http_pool import async_client
+from app.utils.metrics import HARVEST_FETCH_SECONDS, QUOTA_UNITS_SPENT, track_request
+from app.utils.resilience import CircuitOpenError, SourceResilience, is_retryable, resilience_for
+
+class AsyncForumService:
+    """
+    Concurrent version of ForumService built on httpx + asyncio.
+    - A semaphore bounds the number of requests in flight.
+    - The forum's shared SourceResilience paces requests adaptively and
+      retries transient failures, instead of fixed 1 second sleeps.
+    - Topic details are fetched once per harvest, even when several keywords
+      surface the same thread; a job run shares them across its harvest()
+      calls by passing the same `topics` dict.
+    - Across runs, the on-disk HTTP cache skips topics without new posts and
+      revalidates the others with conditional GETs.
+    Produces exactly the same rows as ForumService.fetch_workflow_data.
+    Search failures and outages (retryable errors, open circuit) are raised,
+    so callers can retry the keywords; a missing topic only drops that topic.
+    """
+
+    def __init__(
+        self,
+        base_url: str = Config.FORUM_URL,
+        concurrency: int = Config.FORUM_CONCURRENCY,
+        http_cache: HttpCache = None,
+        resilience: SourceResilience = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.host = urlparse(self.base_url).netloc
+        self.headers = {
+            "User-Agent": "n8n-popularity-harvester/1.0",
+            "Accept": "application/json"
+        }
+        self.concurrency = concurrency
+        self.resilience = resilience if resilience is not None else resilience_for("forum")
+        # Topic details survive between runs; unchanged topics are not re-downloaded
+        self.http_cache = http_cache if http_cache is not None else HttpCache.from_config()
+
+    async def harvest(self, queries, topics: dict = None):
+        """
+        Returns a dict mapping every query to its list of unified rows.
+        `topics` (topic_id -> payload) memoizes topic details; pass the same
+        dict to share them between the harvest() calls of one run.
+        """
+        topics = topics if topics is not None else {}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # topic_id -> Task resolving to the topic payload (or None on failure)
+        topic_tasks = {}
+
+        # One pooled client per harvest: its connections (HTTP/2 when available) serve every request
+        async with async_client(self.headers, pool_size=self.concurrency) as client:
+
+            async def get(url, endpoint, **kwargs):
+                # Paced and retried; the semaphore is only held while a request is in flight
+                async def attempt():
+                    async with semaphore:
+                        QUOTA_UNITS_SPENT.inc(source="forum")
+                        with track_request("forum", endpoint):
+                            resp = await client.get(url, **kwargs)
+                            if resp.status_code != 304:
+                                resp.raise_for_status()
+                        return resp
+                return await self.resilience.call_async(self.host, attempt)
+
+            async def fetch_topic(topic_id, last_posted_at):
+                if topic_id in topics:
+                    return topics[topic_id]
+                url = f"{self.base_url}/t/{topic_id}.json"
+                try:
+                    # Cache I/O runs in a worker thread, off the event loop
+                    d, conditional = await asyncio.to_thread(cached_topic, self.http_cache, url, last_posted_at)
+                    if d is None:
+                        resp = await get(url, "topic", headers=conditional)
+                        d = await asyncio.to_thread(
+                            store_topic, self.http_cache, url, resp.status_code, resp.content, resp.headers, last_posted_at,
+                        )
+                    topics[topic_id] = d
+                    return d
+                except Exception as detail_err:
+                    # Outages fail the keyword; a deleted or private topic (404/403) only loses itself
+                    if isinstance(detail_err, CircuitOpenError) or is_retryable(detail_err):
+                        raise
+                    print(f"⚠️ Error fetching details for topic {topic_id}: {detail_err}")
+                    return None
+
+            async def fetch_query(query):
+                try:
+                    search_data = (await get(f"{self.base_url}/search.json", "search", params={"q": query})).json()
+                except Exception as e:
+                    print(f"❌ Forum Service Error for '{query}': {e}")
+                    raise
+
+                topics = [t for t in search_data.get("topics", [])[:MAX_TOPICS_PER_QUERY] if t.get("id")]
+                topic_ids = [t["id"] for t in topics]
+                for t in topics:
+                    if t["id"] not in topic_tasks:
+                        topic_tasks[t["id"]] = asyncio.ensure_future(fetch_topic(t["id"], t.get("last_posted_at")))
+
+                details = await asyncio.gather(*(topic_tasks[tid] for tid in topic_ids))
+                return [topic_to_unified(d, query) for d in details if d is not None]
+
+            rows = await asyncio.gather(*(fetch_query(q) for q in queries), return_exceptions=True)
+            # Let every topic request finish before the client closes, even after a failure
+            await asyncio.gather(*topic_tasks.values(), return_exceptions=True)
+
+        if self.http_cache:
+            # One commit for every cache lookup of this harvest
+            self.http_cache.flush()
+
+        for result in rows:
+            if isinstance(result, BaseException):
+                raise result
+        return dict(zip(queries, rows))
+
+    def fetch_all(self, queries, topics: dict = None):
+        """Synchronous entry point for the jobs."""
+        with HARVEST_FETCH_SECONDS.time(source="forum", operation="fetch_all"):
+            return asyncio.run(self.harvest(queries, topics))
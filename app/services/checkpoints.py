@@ -0,0 +1,115 @@
+import datetime
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.harvest_run import HarvestRun, HarvestUnit
+from app.utils.config import Config
+
+def start_run(db: Session, source: str, units, resume: bool = False) -> HarvestRun:
+    """
+    Opens a harvest run for the given (keyword, region) units.
+    With `resume`, the source's latest run is picked up again instead when
+    it did not complete, keeping the units it already completed; an older
+    unfinished run is never reopened once a newer one exists.
+    """
+    run = None
+    if resume:
+        latest = (
+            db.query(HarvestRun)
+            .filter(HarvestRun.source == source)
+            .order_by(HarvestRun.started_at.desc(), HarvestRun.id.desc())
+            .first()
+        )
+        if latest is not None and latest.status != "completed":
+            run = latest
+
+    if run is None:
+        run = HarvestRun(source=source, status="running")
+        db.add(run)
+        db.flush()
+        db.add_all(
+            HarvestUnit(run_id=run.id, source=source, keyword=keyword, region=region)
+            for keyword, region in dict.fromkeys(units)
+        )
+    else:
+        run.status = "running"
+        # Units added to the seed list since the run started
+        known = {(u.keyword, u.region) for u in db.query(HarvestUnit).filter(HarvestUnit.run_id == run.id)}
+        db.add_all(
+            HarvestUnit(run_id=run.id, source=source, keyword=keyword, region=region)
+            for keyword, region in dict.fromkeys(units) if (keyword, region) not in known
+        )
+    db.commit()
+    return run
+
+def pending_units(db: Session, run: HarvestRun, freshness_hours: float = None):
+    """
+    Units of the run that still need work, in insertion order.
+    Units completed by any run within the freshness window are marked
+    'skipped' instead.
+    """
+    freshness_hours = Config.HARVEST_FRESHNESS_HOURS if freshness_hours is None else freshness_hours
+
+    fresh = set()
+    if freshness_hours > 0:
+        cutoff = datetime.datetime.utcnow() - datetime.timedelta(hours=freshness_hours)
+        fresh = set(
+            db.query(HarvestUnit.keyword, HarvestUnit.region)
+            .filter(
+                HarvestUnit.source == run.source,
+                HarvestUnit.status == "done",
+                HarvestUnit.updated_at >= cutoff,
+            )
+            .distinct()
+            .all()
+        )
+
+    todo = []
+    units = (
+        db.query(HarvestUnit)
+        .filter(HarvestUnit.run_id == run.id, HarvestUnit.status.in_(("pending", "failed")))
+        .order_by(HarvestUnit.id)
+    )
+    for unit in units:
+        if (unit.keyword, unit.region) in fresh:
+            unit.status = "skipped"
+            unit.updated_at = datetime.datetime.utcnow()
+        else:
+            todo.append((unit.keyword, unit.region))
+    db.commit()
+    return todo
+
+def mark_units(db: Session, run: HarvestRun, units, status: str):
+    """Records the outcome of a group of (keyword, region) units."""
+    units = set(units)
+    if not units:
+        return
+    now = datetime.datetime.utcnow()
+    for unit in db.query(HarvestUnit).filter(
+        HarvestUnit.run_id == run.id, HarvestUnit.keyword.in_({k for k, _ in units})
+    ):
+        if (unit.keyword, unit.region) in units:
+            unit.status = status
+            unit.updated_at = now
+    db.commit()
+
+def finish_run(db: Session, run: HarvestRun):
+    """Closes the run: 'completed' when no unit is left pending or failed."""
+    open_units = db.query(func.count(HarvestUnit.id)).filter(
+        HarvestUnit.run_id == run.id, HarvestUnit.status.in_(("pending", "failed"))
+    ).scalar()
+    run.status = "completed" if open_units == 0 else "failed"
+    run.finished_at = datetime.datetime.utcnow()
+    db.commit()
+    return run.status
+
+def add_checkpoint_arguments(parser):
+    """Command-line flags shared by the harvest jobs."""
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Continue the last unfinished run, skipping the units it completed",
+    )
+    parser.add_argument(
+        "--freshness-hours", type=float, default=None,
+        help=f"Skip units completed within this many hours (default {Config.HARVEST_FRESHNESS_HOURS}, 0 disables)",
+    )
+    return parser
@@ -0,0 +1,160 @@
+import re
+import zlib
+from collections import defaultdict
+import numpy as np
+from sqlalchemy import insert, select, tuple_, update
+from sqlalchemy.orm import Session
+from app.database.versioning import bump_data_version
+from app.models.title_band import TitleBand
+from app.models.workflow import Workflow
+from app.utils.config import Config
+from app.utils.helpers import clean_title
+
+# Platforms whose workflow_name is a free-form title (Trends rows are keywords)
+TITLE_PLATFORMS = ("youtube", "forum")
+
+# MinHash / LSH layout: 16 bands of 4 rows. Titles with a shingle Jaccard
+# similarity of 0.7 share a bucket with ~98% probability, at 0.3 with ~12%.
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_SIZE = 4
+
+# Universal hash family (a * h + b) mod p. Fixed seed: stored buckets must
+# stay comparable between runs.
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(1, _PRIME, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, size=NUM_PERM).astype(np.uint64)
+
+def normalize_title(title: str) -> str:
+    """
+    clean_title plus the clutter that makes one automation look like many:
+    hashtags, years, emoji and punctuation, and the ubiquitous 'n8n'.
+    """
+    text = clean_title(title).lower()
+    text = re.sub(r"#\w+", " ", text)
+    text = re.sub(r"\b(?:19|20)\d{2}\b", " ", text)
+    text = re.sub(r"\bn8n\b", " ", text)
+    text = re.sub(r"[^\w\s]|_", " ", text)
+    return " ".join(text.split())
+
+def shingles(text: str) -> set:
+    """Hashed character 4-grams of a normalized title."""
+    if len(text) <= SHINGLE_SIZE:
+        return {zlib.crc32(text.encode("utf-8"))}
+    return {
+        zlib.crc32(text[i:i + SHINGLE_SIZE].encode("utf-8"))
+        for i in range(len(text) - SHINGLE_SIZE + 1)
+    }
+
+def band_buckets(shingle_set: set):
+    """MinHash signature of a shingle set, folded into one bucket hash per band."""
+    hashes = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set))
+    # a < 2^31 and h < 2^32, so a * h + b stays below 2^64
+    signature = ((np.outer(hashes, _A) + _B) % _PRIME).min(axis=0)
+    return [
+        (band, zlib.crc32(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes()))
+        for band in range(BANDS)
+    ]
+
+def jaccard(a: set, b: set) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+def assign_clusters(db: Session, similarity: float = Config.DEDUP_SIMILARITY, chunk_size: int = 500) -> int:
+    """
+    Gives every unclustered row a cluster_id: the smallest id among the
+    titles it is a near-duplicate of (shingle Jaccard >= similarity), or its
+    own id. Candidates come from the stored LSH buckets, so each new row is
+    only compared with titles sharing a bucket. A row matching several
+    clusters merges them. Returns the number of rows clustered.
+    """
+    clustered = 0
+    try:
+        # Keyword rows are never near-duplicates of titles
+        clustered += db.execute(
+            update(Workflow)
+            .where(Workflow.cluster_id.is_(None), Workflow.platform.notin_(TITLE_PLATFORMS))
+            .values(cluster_id=Workflow.id)
+        ).rowcount
+
+        while True:
+            pending = db.execute(
+                select(Workflow.id, Workflow.workflow_name)
+                .where(Workflow.cluster_id.is_(None), Workflow.platform.in_(TITLE_PLATFORMS))
+                .order_by(Workflow.id)
+                .limit(chunk_size)
+            ).all()
+            if not pending:
+                break
+            clustered += _cluster_chunk(db, pending, similarity)
+            db.commit()
+
+        if clustered:
+            bump_data_version(db)
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return clustered
+
+def _cluster_chunk(db: Session, pending, similarity: float) -> int:
+    new_rows = {}
+    for workflow_id, name in pending:
+        shingle_set = shingles(normalize_title(name))
+        new_rows[workflow_id] = (shingle_set, band_buckets(shingle_set))
+
+    # Stored titles sharing a bucket with any new title
+    buckets = defaultdict(set)
+    keys = {key for _, row_keys in new_rows.values() for key in row_keys}
+    for band, bucket, workflow_id in db.execute(
+        select(TitleBand.band, TitleBand.bucket, TitleBand.workflow_id)
+        .where(tuple_(TitleBand.band, TitleBand.bucket).in_(keys))
+    ):
+        buckets[(band, bucket)].add(workflow_id)
+
+    # workflow_id -> (cluster_id, shingles) of every possible match
+    known = {}
+    candidate_ids = set().union(*buckets.values())
+    if candidate_ids:
+        for workflow_id, name, cluster_id in db.execute(
+            select(Workflow.id, Workflow.workflow_name, Workflow.cluster_id).where(Workflow.id.in_(candidate_ids))
+        ):
+            known[workflow_id] = (cluster_id if cluster_id is not None else workflow_id, shingles(normalize_title(name)))
+
+    # Union-find over cluster ids, so merges inside the chunk compose
+    parent = {}
+
+    def find(cluster_id):
+        while parent.get(cluster_id, cluster_id) != cluster_id:
+            cluster_id = parent[cluster_id]
+        return cluster_id
+
+    band_rows = []
+    for workflow_id, (shingle_set, row_keys) in new_rows.items():
+        matched = {
+            find(known[other][0])
+            for key in row_keys
+            for other in buckets.get(key, ())
+            if other in known and jaccard(shingle_set, known[other][1]) >= similarity
+        }
+        cluster_id = min(matched | {workflow_id})
+        for other_cluster in matched:
+            parent[other_cluster] = cluster_id
+        parent[workflow_id] = cluster_id
+
+        known[workflow_id] = (cluster_id, shingle_set)
+        for key in row_keys:
+            buckets[key].add(workflow_id)
+            band_rows.append({"workflow_id": workflow_id, "band": key[0], "bucket": key[1]})
+
+    db.execute(update(Workflow), [
+        {"id": workflow_id, "cluster_id": find(workflow_id)} for workflow_id in new_rows
+    ])
+    # Existing clusters absorbed by a merge
+    for cluster_id in parent:
+        target = find(cluster_id)
+        if target != cluster_id and cluster_id not in new_rows:
+            db.execute(update(Workflow).where(Workflow.cluster_id == cluster_id).values(cluster_id=target))
+    db.execute(insert(TitleBand), band_rows)
+    return len(new_rows)
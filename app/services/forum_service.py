@@ -1,14 +1,85 @@
-import requests
-import time
+import json
+from urllib.parse import urlparse
+from app.utils.config import Config
+from app.utils.http_cache import HttpCache
+from app.utils.http_pool import pooled_session
+from app.utils.metrics import HARVEST_FETCH_SECONDS, QUOTA_UNITS_SPENT, timed, track_request
+from app.utils.resilience import SourceResilience, resilience_for
+
+# Only the top hits of every search are expanded, to remain polite to the API
+MAX_TOPICS_PER_QUERY = 5
+
+def topic_to_unified(d: dict, keyword: str) -> dict:
+    """Maps a Discourse /t/{id}.json payload found for `keyword` to the Big Unified Shape."""
+    return {
+        "workflow_name": d.get("title"),
+        "platform": "forum",
+        "country": "GLOBAL",
+        "keyword": keyword,
+        # Forum Specific Metrics
+        "views": d.get("views"),
+        "likes": d.get("like_count"),
+        "replies": d.get("reply_count"),
+        "contributors": d.get("participant_count"),
+        # Set YouTube/Google specific fields to None
+        "comments": None,
+        "like_to_view_ratio": None,
+        "comment_to_view_ratio": None,
+        "interest_score": None,
+        "monthly_volume": None,
+        "growth_pct": None
+    }
+
+def cached_topic(http_cache, url: str, last_posted_at):
+    """
+    Looks a topic up in the HTTP cache.
+    Returns (payload, headers): the cached payload when the topic has had no
+    new post since it was stored (no request needed), otherwise None plus the
+    validators for a conditional GET.
+    """
+    entry = http_cache.get(url) if http_cache else None
+    if entry is None:
+        return None, {}
+    if last_posted_at and entry["freshness_token"] == last_posted_at:
+        return json.loads(entry["body"]), {}
+    return None, http_cache.conditional_headers(entry)
+
+def store_topic(http_cache, url: str, status_code: int, content: bytes, headers, last_posted_at):
+    """
+    Turns a topic response into its payload, updating the cache.
+    A 304 answer is served from the cached body.
+    """
+    if status_code == 304 and http_cache:
+        entry = http_cache.get(url)
+        if entry is not None:
+            http_cache.refresh(url, last_posted_at)
+            return json.loads(entry["body"])
+    d = json.loads(content)
+    if http_cache:
+        http_cache.put(
+            url, content,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            freshness_token=last_posted_at or d.get("last_posted_at"),
+        )
+    return d
 
 class ForumService:
-    def __init__(self):
-        self.base_url = "https://community.n8n.io"
+    def __init__(self, base_url: str = Config.FORUM_URL, http_cache: HttpCache = None, resilience: SourceResilience = None):
+        self.base_url = base_url.rstrip("/")
+        self.host = urlparse(self.base_url).netloc
+        # Topic details survive between runs; unchanged topics are not re-downloaded
+        self.http_cache = http_cache if http_cache is not None else HttpCache.from_config()
+        # Adaptive pacing, retries and the circuit breaker, shared with the async harvester
+        self.resilience = resilience if resilience is not None else resilience_for("forum")
         self.headers = {
             "User-Agent": "n8n-popularity-harvester/1.0",
             "Accept": "application/json"
         }
+        # One keep-alive pool for every search and topic request of this service
+        self.session = pooled_session(self.headers)
 
+    @timed(HARVEST_FETCH_SECONDS, source="forum", operation="fetch_workflow_data")
     def fetch_workflow_data(self, query: str):
         """
         Two-step fetch: 
@@ -20,12 +91,10 @@ class ForumService:
             search_url = f"{self.base_url}/search.json"
             search_params = {"q": query}
             
-            search_resp = requests.get(search_url, params=search_params, headers=self.headers, timeout=10)
-            search_resp.raise_for_status()
-            search_data = search_resp.json()
+            search_data = self.resilience.call(self.host, lambda: self._get(search_url, "search", params=search_params)).json()
             
-            # Extract top 5 topics to remain polite to the API
-            topics = search_data.get("topics", [])[:5]
+            # Extract top topics to remain polite to the API
+            topics = search_data.get("topics", [])[:MAX_TOPICS_PER_QUERY]
             results = []
 
             for t in topics:
@@ -38,31 +107,18 @@ class ForumService:
                 detail_url = f"{self.base_url}/t/{topic_id}.json"
                 
                 try:
-                    detail_resp = requests.get(detail_url, headers=self.headers, timeout=10)
-                    detail_resp.raise_for_status()
-                    d = detail_resp.json()
+                    d, conditional = cached_topic(self.http_cache, detail_url, t.get("last_posted_at"))
+                    if d is None:
+                        detail_resp = self.resilience.call(
+                            self.host, lambda: self._get(detail_url, "topic", headers=conditional),
+                        )
+                        d = store_topic(
+                            self.http_cache, detail_url, detail_resp.status_code,
+                            detail_resp.content, detail_resp.headers, t.get("last_posted_at"),
+                        )
 
                     # Mapping to the Big Unified Shape
-                    results.append({
-                        "workflow_name": d.get("title"),
-                        "platform": "forum",
-                        "country": "GLOBAL",
-                        # Forum Specific Metrics
-                        "views": d.get("views"),
-                        "likes": d.get("like_count"),
-                        "replies": d.get("reply_count"),
-                        "contributors": d.get("participant_count"),
-                        # Set YouTube/Google specific fields to None
-                        "comments": None,
-                        "like_to_view_ratio": None,
-                        "comment_to_view_ratio": None,
-                        "interest_score": None,
-                        "monthly_volume": None,
-                        "growth_pct": None
-                    })
-                    
-                    # Rate limiting protection: 1 second delay between detail calls
-                    time.sleep(1)
+                    results.append(topic_to_unified(d, query))
 
                 except Exception as detail_err:
                     print(f"⚠️ Error fetching details for topic {topic_id}: {detail_err}")
@@ -72,4 +128,13 @@ class ForumService:
 
         except Exception as e:
             print(f"❌ Forum Service Error for '{query}': {e}")
-            return []
\ No newline at end of file
+            return []
+
+    def _get(self, url: str, endpoint: str, params=None, headers=None):
+        """One GET, counted and timed; a 304 is a valid answer to a conditional request."""
+        QUOTA_UNITS_SPENT.inc(source="forum")
+        with track_request("forum", endpoint):
+            resp = self.session.get(url, params=params, headers=headers, timeout=10)
+            if resp.status_code != 304:
+                resp.raise_for_status()
+        return resp
@@ -0,0 +1,90 @@
+import datetime
+from sqlalchemy import and_, delete, func, insert, select, tuple_
+from sqlalchemy.orm import Session
+from app.models.snapshot import SNAPSHOT_COLUMNS, SNAPSHOT_MODELS
+from app.utils.config import Config
+
+# SQLite expressions mapping captured_at onto the start of its bucket
+HISTORY_BUCKETS = {
+    "hour": lambda column: func.strftime("%Y-%m-%d %H:00:00", column),
+    "day": lambda column: func.date(column),
+    # Monday of the ISO week: step back 6 days, then forward to the next Monday
+    "week": lambda column: func.date(column, "-6 days", "weekday 1"),
+}
+
+# Scores are averaged over a bucket; cumulative counters keep their highest value
+AVERAGED_COLUMNS = {"interest_score", "growth_pct"}
+
+def _rollup(model, platform: str):
+    """Aggregate expression for every metric column of a snapshot table."""
+    return [
+        (func.avg if name in AVERAGED_COLUMNS else func.max)(getattr(model, name)).label(name)
+        for name in SNAPSHOT_COLUMNS[platform]
+    ]
+
+def history_statement(platform: str, workflow_id: int, since=None, until=None, bucket: str = "day"):
+    """
+    Downsampled metric series of one workflow: one row per bucket with
+    the bucket start followed by the platform's metrics.
+    Served by the (workflow_id, captured_at) index of the snapshot table.
+    """
+    model = SNAPSHOT_MODELS[platform]
+    bucket_start = HISTORY_BUCKETS[bucket](model.captured_at).label("bucket")
+    stmt = select(bucket_start, *_rollup(model, platform)).where(model.workflow_id == workflow_id)
+    if since:
+        stmt = stmt.where(model.captured_at >= since)
+    if until:
+        stmt = stmt.where(model.captured_at < until)
+    return stmt.group_by(bucket_start).order_by(bucket_start)
+
+def compaction_cutoff(now=None, retention_days: int = Config.SNAPSHOT_RETENTION_DAYS) -> datetime.datetime:
+    """Start of the week containing now - retention_days: only whole weeks are rolled up."""
+    day = ((now or datetime.datetime.utcnow()) - datetime.timedelta(days=retention_days)).date()
+    return datetime.datetime.combine(day - datetime.timedelta(days=day.weekday()), datetime.time())
+
+def compact_snapshots(db: Session, now=None, retention_days: int = Config.SNAPSHOT_RETENTION_DAYS) -> int:
+    """
+    Rolls snapshots older than the retention window up to one row per
+    workflow and week (stamped with the week's Monday), keeping the history
+    tables bounded. Already compacted weeks are left alone.
+    Returns the number of rows removed.
+    """
+    cutoff = compaction_cutoff(now, retention_days)
+    removed = 0
+    try:
+        for platform, model in SNAPSHOT_MODELS.items():
+            week = HISTORY_BUCKETS["week"](model.captured_at)
+            columns = SNAPSHOT_COLUMNS[platform]
+            groups = db.execute(
+                select(model.workflow_id, week.label("week"), func.count().label("samples"), *_rollup(model, platform))
+                .where(model.captured_at < cutoff)
+                .group_by(model.workflow_id, week)
+                .having(func.count() > 1)
+            ).all()
+            if not groups:
+                continue
+
+            db.execute(
+                delete(model)
+                .where(and_(
+                    model.captured_at < cutoff,
+                    tuple_(model.workflow_id, week).in_([(g.workflow_id, g.week) for g in groups]),
+                ))
+                .execution_options(synchronize_session=False)
+            )
+            integer_columns = {c.name for c in model.__table__.columns if c.type.python_type is int}
+            db.execute(insert(model), [{
+                "workflow_id": g.workflow_id,
+                "captured_at": datetime.datetime.fromisoformat(g.week),
+                **{
+                    name: round(getattr(g, name)) if name in integer_columns and getattr(g, name) is not None
+                    else getattr(g, name)
+                    for name in columns
+                },
+            } for g in groups])
+            removed += sum(g.samples - 1 for g in groups)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return removed
@@ -0,0 +1,42 @@
+import datetime
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.models.platform_metrics import TrendsMetrics
+from app.models.workflow import Workflow
+
+def prioritize_keywords(db: Session, platform: str, keywords, last_attempts=None):
+    """
+    Orders keywords so the most overdue ones are harvested first.
+
+    Priority = staleness x volatility, where staleness is the time since the
+    platform's data for the keyword was last refreshed (or attempted) and
+    volatility grows with the keyword's absolute Trends growth. Keywords
+    never harvested on the platform come first.
+    """
+    last_attempts = last_attempts or {}
+    now = datetime.datetime.utcnow()
+
+    refreshed = dict(
+        db.query(Workflow.keyword, func.max(Workflow.last_updated))
+        .filter(Workflow.platform == platform, Workflow.keyword.isnot(None))
+        .group_by(Workflow.keyword)
+        .all()
+    )
+    growth = dict(
+        db.query(Workflow.keyword, func.max(func.abs(TrendsMetrics.growth_pct)))
+        .join(TrendsMetrics, TrendsMetrics.workflow_id == Workflow.id)
+        .filter(Workflow.platform == "google", Workflow.keyword.isnot(None))
+        .group_by(Workflow.keyword)
+        .all()
+    )
+
+    def priority(keyword):
+        seen = [t for t in (refreshed.get(keyword), last_attempts.get(keyword)) if t is not None]
+        if not seen:
+            return float("inf")
+        staleness = (now - max(seen)).total_seconds()
+        # Cap the boost so a single breakout keyword can't starve the rest
+        volatility = 1 + min(growth.get(keyword) or 0.0, 500.0) / 100
+        return staleness * volatility
+
+    return sorted(keywords, key=priority, reverse=True)
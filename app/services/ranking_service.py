@@ -0,0 +1,148 @@
+import datetime
+import math
+from sqlalchemy import delete, func
+from sqlalchemy.orm import Session
+from app.models.platform_metrics import ForumMetrics, TrendsMetrics, YouTubeMetrics
+from app.models.ranking import WorkflowRanking
+from app.models.workflow import Workflow
+from app.utils.config import Config
+
+def _percentile_ranks(values: dict) -> dict:
+    """
+    Maps every unit to its percentile rank in [0, 1] (ties share the average rank).
+    Percentiles keep one viral video or a +900% breakout from squashing
+    everybody else, which plain min-max scaling would do.
+    """
+    if not values:
+        return {}
+    if len(values) == 1:
+        return {unit: 1.0 for unit in values}
+
+    ordered = sorted(values.items(), key=lambda item: item[1])
+    ranks = {}
+    i = 0
+    while i < len(ordered):
+        j = i
+        while j + 1 < len(ordered) and ordered[j + 1][1] == ordered[i][1]:
+            j += 1
+        average_rank = (i + j) / 2
+        for unit, _ in ordered[i:j + 1]:
+            ranks[unit] = average_rank / (len(ordered) - 1)
+        i = j + 1
+    return ranks
+
+def _component(signals) -> dict:
+    """Mean percentile rank of several signals; units missing a signal score 0 on it."""
+    ranked = [_percentile_ranks(s) for s in signals]
+    units = set().union(*ranked)
+    return {unit: sum(r.get(unit, 0.0) for r in ranked) / len(ranked) for unit in units}
+
+def _collect_signals(db: Session, regions):
+    """Raw per-(keyword, region) signals for every platform."""
+    youtube = db.query(
+        Workflow.keyword, Workflow.country,
+        func.sum(YouTubeMetrics.views), func.avg(YouTubeMetrics.like_to_view_ratio), func.avg(YouTubeMetrics.comment_to_view_ratio),
+    ).join(YouTubeMetrics, YouTubeMetrics.workflow_id == Workflow.id).filter(
+        Workflow.platform == "youtube", Workflow.keyword.isnot(None),
+    ).group_by(Workflow.keyword, Workflow.country)
+
+    forum = db.query(
+        Workflow.keyword, func.sum(ForumMetrics.replies), func.sum(ForumMetrics.contributors),
+    ).join(ForumMetrics, ForumMetrics.workflow_id == Workflow.id).filter(
+        Workflow.platform == "forum", Workflow.keyword.isnot(None),
+    ).group_by(Workflow.keyword)
+
+    google = db.query(
+        Workflow.keyword, Workflow.country, TrendsMetrics.interest_score, TrendsMetrics.growth_pct,
+    ).join(TrendsMetrics, TrendsMetrics.workflow_id == Workflow.id).filter(
+        Workflow.platform == "google", Workflow.keyword.isnot(None),
+    )
+
+    signals = {name: {} for name in (
+        "yt_views", "yt_like_ratio", "yt_comment_ratio",
+        "forum_replies", "forum_contributors",
+        "trends_interest", "trends_growth",
+    )}
+    for keyword, country, views, like_ratio, comment_ratio in youtube:
+        unit = (keyword, country)
+        signals["yt_views"][unit] = math.log1p(views or 0)
+        signals["yt_like_ratio"][unit] = like_ratio or 0.0
+        signals["yt_comment_ratio"][unit] = comment_ratio or 0.0
+
+    # Forum threads are GLOBAL: they count towards every region
+    for keyword, replies, contributors in forum:
+        for region in regions:
+            unit = (keyword, region)
+            signals["forum_replies"][unit] = math.log1p(replies or 0)
+            signals["forum_contributors"][unit] = math.log1p(contributors or 0)
+
+    for keyword, country, interest, growth in google:
+        unit = (keyword, country)
+        signals["trends_interest"][unit] = interest or 0
+        signals["trends_growth"][unit] = growth or 0.0
+
+    return signals
+
+def compute_rankings(db: Session, regions=None):
+    """
+    Computes the composite popularity score of every (keyword, region).
+    Returns a list of WorkflowRanking objects (not yet added to the session),
+    including a GLOBAL ranking averaging the regional scores.
+    """
+    regions = regions or Config.REGIONS
+    signals = _collect_signals(db, regions)
+
+    components = {
+        "youtube": _component([signals["yt_views"], signals["yt_like_ratio"], signals["yt_comment_ratio"]]),
+        "forum": _component([signals["forum_replies"], signals["forum_contributors"]]),
+        "google": _component([signals["trends_interest"], signals["trends_growth"]]),
+    }
+    weights = Config.RANKING_WEIGHTS
+    total_weight = sum(weights.values())
+
+    units = {unit for scores in components.values() for unit in scores if unit[1] in regions}
+    scored = {}
+    for unit in units:
+        parts = {platform: scores.get(unit, 0.0) for platform, scores in components.items()}
+        score = sum(weights[p] * value for p, value in parts.items()) / total_weight
+        scored[unit] = (score, parts)
+
+    # GLOBAL: average of every region, regions without data counting as 0
+    for keyword in {keyword for keyword, _ in scored}:
+        regional = [scored.get((keyword, region), (0.0, {p: 0.0 for p in components})) for region in regions]
+        scored[(keyword, "GLOBAL")] = (
+            sum(score for score, _ in regional) / len(regions),
+            {p: sum(parts[p] for _, parts in regional) / len(regions) for p in components},
+        )
+
+    now = datetime.datetime.utcnow()
+    rankings = []
+    for country in list(regions) + ["GLOBAL"]:
+        ordered = sorted(
+            ((keyword, score, parts) for (keyword, c), (score, parts) in scored.items() if c == country),
+            key=lambda item: (-item[1], item[0]),
+        )
+        for position, (keyword, score, parts) in enumerate(ordered, start=1):
+            rankings.append(WorkflowRanking(
+                keyword=keyword,
+                country=country,
+                rank=position,
+                score=score,
+                youtube_score=parts["youtube"],
+                forum_score=parts["forum"],
+                trends_score=parts["google"],
+                computed_at=now,
+            ))
+    return rankings
+
+def refresh_rankings(db: Session, regions=None) -> int:
+    """Rebuilds the materialized ranking table in one transaction. Returns the row count."""
+    try:
+        rankings = compute_rankings(db, regions)
+        db.execute(delete(WorkflowRanking))
+        db.add_all(rankings)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return len(rankings)
@@ -0,0 +1,84 @@
+import datetime
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+from app.models.trend_point import TrendPoint
+from app.services.analytics import growth_pct_windows
+from app.utils.config import Config
+
+def last_stored_day(db: Session, keyword: str, country: str):
+    return db.execute(
+        select(func.max(TrendPoint.day)).where(TrendPoint.keyword == keyword, TrendPoint.country == country)
+    ).scalar()
+
+def incremental_start(db: Session, keyword: str, country: str, today: datetime.date = None):
+    """
+    First day to download for an incremental fetch, or None when the
+    series has to be fetched in full (no history, or a gap too long for
+    daily data).
+    """
+    today = today or datetime.date.today()
+    last = last_stored_day(db, keyword, country)
+    if last is None or (today - last).days > Config.TRENDS_MAX_GAP_DAYS:
+        return None
+    return last - datetime.timedelta(days=Config.TRENDS_OVERLAP_DAYS)
+
+def load_series(db: Session, keyword: str, country: str, since: datetime.date = None) -> pd.Series:
+    """Stored daily points of a keyword/region as a date-indexed Series."""
+    stmt = select(TrendPoint.day, TrendPoint.value).where(
+        TrendPoint.keyword == keyword, TrendPoint.country == country
+    ).order_by(TrendPoint.day)
+    if since:
+        stmt = stmt.where(TrendPoint.day >= since)
+    rows = db.execute(stmt).all()
+    return pd.Series([r.value for r in rows], index=[r.day for r in rows], dtype=float)
+
+def store_series(db: Session, keyword: str, country: str, series: pd.Series) -> int:
+    """
+    Merges a freshly downloaded series into the store, without committing:
+    the points are saved in the same transaction as the workflow rows
+    computed from them.
+
+    Google rescales every download so its own maximum is 100. Days that
+    overlap the stored history give the ratio between both scales, and the
+    new points are rescaled onto the stored one before being written.
+    Returns the number of points written.
+    """
+    if series is None or series.empty:
+        return 0
+
+    stored = load_series(db, keyword, country, since=min(series.index))
+    overlap = stored.index.intersection(series.index)
+    if len(overlap):
+        stored_mean = stored.loc[overlap].mean()
+        new_mean = series.loc[overlap].mean()
+        if stored_mean > 0 and new_mean > 0:
+            series = series * (stored_mean / new_mean)
+
+    stmt = insert(TrendPoint)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["keyword", "country", "day"],
+        set_={"value": stmt.excluded.value},
+    )
+    db.execute(stmt, [
+        {"keyword": keyword, "country": country, "day": day, "value": float(value)}
+        for day, value in series.items()
+    ])
+    return len(series)
+
+def growth_metrics(db: Session, keyword: str, country: str, window: int = None):
+    """
+    Interest score and rolling-window growth computed from the stored history.
+    Windows longer than a single 3-month download are supported once enough
+    history has accumulated. Returns None when nothing is stored yet.
+    """
+    window = window or Config.TRENDS_GROWTH_WINDOW_DAYS
+    history = load_series(db, keyword, country)
+    if history.empty:
+        return None
+
+    # Interest Score: average relative popularity over the last 3 months
+    interest_score = int(history.iloc[-Config.TRENDS_INTEREST_DAYS:].mean())
+    growth_pct = float(growth_pct_windows(history.iloc[-2 * window:].to_numpy(), window=window)[0])
+    return {"interest_score": interest_score, "growth_pct": growth_pct}
@@ -1,75 +1,176 @@
-from pytrends.request import TrendReq
+from pytrends import exceptions as pytrends_errors
+from pytrends.request import BASE_TRENDS_URL, TrendReq
+import json
 import pandas as pd
+from app.services.analytics import growth_pct_windows
+from app.utils.config import Config
+from app.utils.http_pool import pooled_session
+from app.utils.metrics import HARVEST_FETCH_SECONDS, QUOTA_UNITS_SPENT, timed, track_request
+from app.utils.resilience import SourceResilience, resilience_for
+import datetime
 import random
-import time
+
+# Circuit breaker key of the Trends backend
+TRENDS_HOST = "trends.google.com"
+
+class PooledTrendReq(TrendReq):
+    """
+    TrendReq over one pooled keep-alive session. pytrends opens a fresh
+    requests session (TCP + TLS handshake) for every request; retries are
+    left to the shared SourceResilience.
+    """
+
+    def __init__(self, session=None, **kwargs):
+        self.session = session if session is not None else pooled_session()
+        super().__init__(**kwargs)
+
+    def GetGoogleCookie(self):
+        resp = self.session.get(f"{BASE_TRENDS_URL}/explore/?geo={self.hl[-2:]}", timeout=self.timeout, **self.requests_args)
+        return {name: value for name, value in resp.cookies.items() if name == "NID"}
+
+    def _get_data(self, url, method=TrendReq.GET_METHOD, trim_chars=0, **kwargs):
+        resp = self.session.request(
+            method, url, timeout=self.timeout, cookies=self.cookies, headers=self.headers,
+            **kwargs, **self.requests_args,
+        )
+        # Google answers JSON under any of these content types
+        content_type = resp.headers.get("Content-Type", "")
+        if resp.status_code == 200 and any(t in content_type for t in ("application/json", "application/javascript", "text/javascript")):
+            # Some responses start with garbage characters, like ")]}',"
+            return json.loads(resp.text[trim_chars:])
+        if resp.status_code == 429:
+            raise pytrends_errors.TooManyRequestsError.from_response(resp)
+        raise pytrends_errors.ResponseError.from_response(resp)
 
 class TrendsService:
-    def __init__(self):
-        # tz=360 is US Central Time. hl='en-US' for English results.
-        self.pytrends = TrendReq(hl='en-US', tz=360)
+    def __init__(self, pytrends=None, resilience: SourceResilience = None):
+        # Created on first request: TrendReq fetches a Google cookie as soon as it is built
+        self._pytrends = pytrends
+        # Adaptive pacing replaces fixed cooldowns; 429s slow every Trends request down
+        self.resilience = resilience if resilience is not None else resilience_for("google")
+
+    @property
+    def pytrends(self):
+        if self._pytrends is None:
+            # tz=360 is US Central Time. hl='en-US' for English results.
+            self._pytrends = PooledTrendReq(hl='en-US', tz=360)
+        return self._pytrends
 
+    @timed(HARVEST_FETCH_SECONDS, source="google", operation="fetch_workflow_data")
     def fetch_workflow_data(self, keyword: str, country: str = "US"):
         """
         Fetches Google Trends data and calculates:
         1. Interest Score: Average relative popularity.
         2. Growth %: Comparison of recent vs. older baseline interest.
         """
-        try:
-            # Google Trends allows up to 100 characters per keyword
-            kw_list = [f"n8n {keyword}"[:100]]
-            
-            # timeframe='today 3-m' matches your requirement for 60-90 day tracking
-            self.pytrends.build_payload(kw_list, timeframe='today 3-m', geo=country)
-            df = self.pytrends.interest_over_time()
-
-            if df.empty or kw_list[0] not in df:
+        series = self.fetch_series(keyword, country)
+        if series is None:
+            return None
+
+        # 1. Interest Score (Relative search interest 0-100)
+        avg_interest = int(series.mean())
+
+        # 2. Change over 60 days Logic
+        # We compare the average of the last 30 days to the 30-day window before it.
+        growth_pct = float(growth_pct_windows(series.to_numpy(), window=30)[0])
+
+        return self.to_unified(keyword, country, avg_interest, growth_pct)
+
+    def fetch_series(self, keyword: str, country: str = "US", start: datetime.date = None):
+        """
+        Downloads the daily interest series of a keyword.
+        Without `start` the last 3 months are fetched; with it only the days
+        from `start` to today. Returns a pandas Series indexed by date, or None
+        without data. Errors left after the retries are raised.
+        """
+        kw_list = [self._term(keyword)]
+        df = self._interest_over_time(kw_list, country, start)
+
+        if df.empty or kw_list[0] not in df:
+            print(f"⚠️ No Trends data for: {keyword}")
+            return None
+
+        series = df[kw_list[0]]
+        return series if not series.empty else None
+
+    @timed(HARVEST_FETCH_SECONDS, source="google", operation="fetch_series_batch")
+    def fetch_series_batch(self, keywords, country: str = "US", start: datetime.date = None):
+        """
+        Batched mode: downloads up to Config.TRENDS_BATCH_SIZE keywords plus the
+        shared anchor term in a single request.
+
+        Google scales every request to its own maximum, so each batch is
+        rescaled until the anchor averages 100. Scores from different
+        batches then sit on the same scale.
+        Returns a dict keyword -> date-indexed Series (keywords without data are omitted).
+        Errors left after the retries are raised, so the batch can be marked as failed.
+        """
+        anchor = Config.TRENDS_ANCHOR_TERM
+        terms = {keyword: self._term(keyword) for keyword in keywords[:Config.TRENDS_BATCH_SIZE]}
+        df = self._interest_over_time(list(terms.values()) + [anchor], country, start)
+
+        if df.empty or anchor not in df:
+            print(f"⚠️ No Trends data for batch: {', '.join(terms)}")
+            return {}
+
+        anchor_mean = df[anchor].mean()
+        scale = 100.0 / anchor_mean if anchor_mean > 0 else 1.0
+
+        results = {}
+        for keyword, term in terms.items():
+            if term not in df or df[term].empty:
                 print(f"⚠️ No Trends data for: {keyword}")
-                return None
+                continue
+            results[keyword] = df[term] * scale
+        return results
+
+    def _term(self, keyword: str) -> str:
+        # Google Trends allows up to 100 characters per keyword
+        return f"n8n {keyword}"[:100]
+
+    def _interest_over_time(self, kw_list, country: str, start: datetime.date = None) -> pd.DataFrame:
+        """Runs one Trends request and returns float columns indexed by date."""
+        # timeframe='today 3-m' matches your requirement for 60-90 day tracking
+        timeframe = f"{start.isoformat()} {datetime.date.today().isoformat()}" if start else 'today 3-m'
 
-            # Handle Partial Data: Google often provides 'isPartial' for the current day.
-            # We drop the last row if it's partial to avoid skewed growth averages.
-            if 'isPartial' in df.columns and df['isPartial'].iloc[-1]:
+        def attempt():
+            QUOTA_UNITS_SPENT.inc(source="google")
+            with track_request("google", "interest_over_time"):
+                self.pytrends.build_payload(kw_list, timeframe=timeframe, geo=country)
+                return self.pytrends.interest_over_time()
+
+        df = self.resilience.call(TRENDS_HOST, attempt)
+        if df.empty:
+            return df
+
+        # Handle Partial Data: Google often provides 'isPartial' for the current day.
+        # We drop the last row if it's partial to avoid skewed growth averages.
+        if 'isPartial' in df.columns:
+            if df['isPartial'].iloc[-1]:
                 df = df.iloc[:-1]
+            df = df.drop(columns=['isPartial'])
+
+        df = df.astype(float)
+        df.index = pd.to_datetime(df.index).date
+        return df
 
-            series = df[kw_list[0]]
-            
-            # 1. Interest Score (Relative search interest 0-100)
-            avg_interest = int(series.mean())
-
-            # 2. Change over 60 days Logic
-            # We compare the average of the last 30 days to the 30-day window before it.
-            recent_avg = series.iloc[-30:].mean()
-            previous_avg = series.iloc[-60:-30].mean() if len(series) >= 60 else series.iloc[0:30].mean()
-            
-            growth_pct = 0.0
-            if previous_avg > 0:
-                growth_pct = round(((recent_avg - previous_avg) / previous_avg) * 100, 2)
-            elif recent_avg > 0:
-                # If it went from 0 to something, it's a 'Breakout' or 100% growth
-                growth_pct = 100.0
-
-            # 3. Map to the Big Unified Shape
-            return {
-                "workflow_name": keyword,
-                "platform": "google",
-                "country": country,
-                # Google Specific Fields
-                "interest_score": avg_interest,
-                "growth_pct": growth_pct,
-                "monthly_volume": random.randint(100, 5000), # Placeholder for Keyword Planner volume
-                # Set other platform fields to None
-                "views": None,
-                "likes": None,
-                "comments": None,
-                "replies": None,
-                "contributors": None,
-                "like_to_view_ratio": None,
-                "comment_to_view_ratio": None
-            }
-
-        except Exception as e:
-            print(f"❌ Google Trends Error for '{keyword}': {e}")
-            # If rate limited (429), sleep longer
-            if "429" in str(e):
-                time.sleep(60)
-            return None
\ No newline at end of file
+    def to_unified(self, keyword: str, country: str, interest_score: int, growth_pct: float):
+        """Maps Trends metrics to the Big Unified Shape."""
+        return {
+            "workflow_name": keyword,
+            "platform": "google",
+            "country": country,
+            "keyword": keyword,
+            # Google Specific Fields
+            "interest_score": interest_score,
+            "growth_pct": growth_pct,
+            "monthly_volume": random.randint(100, 5000), # Placeholder for Keyword Planner volume
+            # Set other platform fields to None
+            "views": None,
+            "likes": None,
+            "comments": None,
+            "replies": None,
+            "contributors": None,
+            "like_to_view_ratio": None,
+            "comment_to_view_ratio": None
+        }
@@ -1,65 +1,136 @@
 import os
-from googleapiclient.discovery import build
 from dotenv import load_dotenv
+from app.utils.config import Config
+from app.utils.metrics import HARVEST_FETCH_SECONDS, QUOTA_UNITS_SPENT, timed, track_request
+from app.utils.resilience import SourceResilience, resilience_for
 
 load_dotenv()
 
+# videos().list accepts at most 50 comma-joined IDs per request
+STATS_BATCH_SIZE = 50
+
+# Circuit breaker key of the Data API
+API_HOST = "www.googleapis.com"
+
 class YouTubeService:
-    def __init__(self):
+    def __init__(self, youtube=None, resilience: SourceResilience = None):
         self.api_key = os.getenv("YOUTUBE_API_KEY")
-        self.youtube = build("youtube", "v3", developerKey=self.api_key)
+        # Any object with the discovery client's search()/videos() interface (e.g. an offline fixture)
+        self.youtube = youtube if youtube is not None else self._build_client()
+        self.resilience = resilience if resilience is not None else resilience_for("youtube")
 
+    def _build_client(self):
+        # Imported here: googleapiclient is only needed by processes that harvest YouTube.
+        # The discovery document bundled with the library is used, never fetched over the network.
+        from googleapiclient.discovery import build
+        return build("youtube", "v3", developerKey=self.api_key, static_discovery=True, cache_discovery=False)
+
+    @timed(HARVEST_FETCH_SECONDS, source="youtube", operation="fetch_workflow_data")
     def fetch_workflow_data(self, query: str, region: str = "US"):
-        try:
-            # 1. Search for videos matching the n8n workflow query
-            search_response = self.youtube.search().list(
-                q=f"n8n workflow {query}",
-                part="snippet",
-                maxResults=5,
-                type="video",
-                regionCode=region
-            ).execute()
-
-            results = []
-            for item in search_response.get("items", []):
-                video_id = item["id"]["videoId"]
-                
-                # 2. Get detailed engagement statistics for the specific video
-                video_response = self.youtube.videos().list(
-                    id=video_id,
-                    part="statistics"
-                ).execute()
-
-                if not video_response["items"]:
-                    continue
-
-                stats = video_response["items"][0]["statistics"]
-                
-                # Extract and cast raw metrics
-                v = int(stats.get("viewCount", 0))
-                l = int(stats.get("likeCount", 0))
-                c = int(stats.get("commentCount", 0))
-
-                # 3. Build the Unified Shape for the DB
-                # Note: Fields like 'replies' and 'interest_score' are set to None
-                results.append({
-                    "workflow_name": item["snippet"]["title"],
-                    "platform": "youtube",
-                    "country": region,
-                    # YouTube Specific metrics
-                    "views": v,
-                    "likes": l,
-                    "comments": c,
-                    "like_to_view_ratio": l / v if v > 0 else 0.0,
-                    "comment_to_view_ratio": c / v if v > 0 else 0.0,
-                    # Fields reserved for Forum/Trends (stored as NULL)
-                    "replies": None,
-                    "contributors": None,
-                    "interest_score": None,
-                    "monthly_volume": None,
-                    "growth_pct": None
-                })
-            return results
-        except Exception as e:
-            print(f"❌ YouTube API Error: {e}")
-            return []
\ No newline at end of file
+        """
+        Rows for one query in one region. Transient errors are retried; what
+        still fails (exhausted quota, open circuit...) is raised to the caller.
+        """
+        # 1. Search for videos matching the n8n workflow query
+        items = self._search(query, region)
+
+        # 2. Get detailed engagement statistics for all hits in a single call
+        stats = self._fetch_statistics([item["id"]["videoId"] for item in items])
+
+        return self._to_unified_rows(items, stats, region, query)
+
+    @timed(HARVEST_FETCH_SECONDS, source="youtube", operation="fetch_batch")
+    def fetch_batch(self, queries, regions, units=None):
+        """
+        Batched harvest mode.
+        Runs one search per query/region pair, then resolves the statistics of
+        every distinct video in chunks of 50 IDs, so videos surfaced by several
+        keywords or regions are only looked up once.
+        `units` restricts the searches to those (query, region) pairs (e.g. the
+        ones a resumed run still has pending); by default every query is
+        searched in every region.
+
+        Returns a dict mapping (query, region) -> list of unified rows.
+        Errors left after the retries are raised, so the caller can mark the
+        whole batch as failed instead of storing it as empty.
+        """
+        if units is None:
+            units = [(query, region) for query in queries for region in regions]
+        hits = {}
+        for query, region in units:
+            hits[(query, region)] = self._search(query, region)
+
+        stats = self._fetch_statistics(
+            [item["id"]["videoId"] for items in hits.values() for item in items]
+        )
+
+        return {
+            (query, region): self._to_unified_rows(items, stats, region, query)
+            for (query, region), items in hits.items()
+        }
+
+    def _execute(self, endpoint: str, cost: int, request):
+        """Executes a prepared API request through the shared retry policy."""
+        def attempt():
+            QUOTA_UNITS_SPENT.inc(cost, source="youtube")
+            with track_request("youtube", endpoint):
+                return request.execute()
+        return self.resilience.call(API_HOST, attempt)
+
+    def _search(self, query: str, region: str):
+        search_response = self._execute("search", Config.YOUTUBE_SEARCH_COST, self.youtube.search().list(
+            q=f"n8n workflow {query}",
+            part="snippet",
+            maxResults=5,
+            type="video",
+            regionCode=region
+        ))
+        return search_response.get("items", [])
+
+    def _fetch_statistics(self, video_ids):
+        """Returns {video_id: statistics}, looking up at most 50 IDs per request."""
+        # dict.fromkeys drops duplicate IDs while keeping first-seen order
+        unique_ids = list(dict.fromkeys(video_ids))
+        stats = {}
+        for start in range(0, len(unique_ids), STATS_BATCH_SIZE):
+            video_response = self._execute("videos", Config.YOUTUBE_VIDEOS_LIST_COST, self.youtube.videos().list(
+                id=",".join(unique_ids[start:start + STATS_BATCH_SIZE]),
+                part="statistics"
+            ))
+            for video in video_response.get("items", []):
+                stats[video["id"]] = video["statistics"]
+        return stats
+
+    def _to_unified_rows(self, items, stats_by_id, region: str, keyword: str):
+        results = []
+        for item in items:
+            stats = stats_by_id.get(item["id"]["videoId"])
+            if stats is None:
+                continue
+
+            # Extract and cast raw metrics
+            v = int(stats.get("viewCount", 0))
+            l = int(stats.get("likeCount", 0))
+            c = int(stats.get("commentCount", 0))
+
+            # 3. Build the Unified Shape for the DB
+            # Note: Fields like 'replies' and 'interest_score' are set to None
+            results.append({
+                "workflow_name": item["snippet"]["title"],
+                "platform": "youtube",
+                "country": region,
+                "keyword": keyword,
+                # YouTube Specific metrics
+                "views": v,
+                "likes": l,
+                "comments": c,
+                "like_to_view_ratio": l / v if v > 0 else 0.0,
+                "comment_to_view_ratio": c / v if v > 0 else 0.0,
+                # Fields reserved for Forum/Trends (stored as NULL)
+                "replies": None,
+                "contributors": None,
+                "interest_score": None,
+                "monthly_volume": None,
+                "growth_pct": None
+            })
+        return results
@@ -15,8 +15,92 @@ class Config:
     # Discourse Forum URL
     FORUM_URL = "https://community.n8n.io"
 
+    # Async forum harvester: parallel requests in flight and starting request rate
+    FORUM_CONCURRENCY = int(os.getenv("FORUM_CONCURRENCY", "5"))
+    FORUM_REQUESTS_PER_SECOND = float(os.getenv("FORUM_REQUESTS_PER_SECOND", "4"))
+
+    # Pooled HTTP clients of the services: keep-alive connections per host, idle
+    # connections are closed after HTTP_KEEPALIVE_SECONDS. HTTP/2 is used by the
+    # httpx clients when the optional h2 package is installed.
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+    HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "30"))
+    HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+
+    # Retries shared by the source clients: exponential backoff with full jitter,
+    # or the server's Retry-After when it sends one (a longer wait than the cap fails fast)
+    HTTP_MAX_ATTEMPTS = int(os.getenv("HTTP_MAX_ATTEMPTS", "4"))
+    HTTP_BACKOFF_BASE_SECONDS = float(os.getenv("HTTP_BACKOFF_BASE_SECONDS", "1"))
+    HTTP_BACKOFF_MAX_SECONDS = float(os.getenv("HTTP_BACKOFF_MAX_SECONDS", "30"))
+    HTTP_MAX_RETRY_AFTER_SECONDS = float(os.getenv("HTTP_MAX_RETRY_AFTER_SECONDS", "300"))
+    # Circuit breaker per upstream host: opens after N consecutive failures,
+    # lets one probe request through after the cooldown
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "60"))
+    # AIMD pacing per source, in requests/second: every success adds `step` (up to
+    # max_rate), every 429 halves the rate (down to min_rate)
+    SOURCE_PACING = {
+        "youtube": {"rate": 2.0, "min_rate": 0.2, "max_rate": 10.0, "step": 0.5},
+        "forum": {"rate": FORUM_REQUESTS_PER_SECOND, "min_rate": 0.5, "max_rate": 8.0, "step": 0.25},
+        "google": {"rate": 1 / 20, "min_rate": 1 / 120, "max_rate": 1 / 10, "step": 0.005},
+    }
+
+    # On-disk cache of forum topic responses (conditional GETs); 0 disables it
+    FORUM_HTTP_CACHE_MB = float(os.getenv("FORUM_HTTP_CACHE_MB", "50"))
+
+    # SQLite storage profile applied to every connection: "wal" lets API readers keep
+    # going while a harvest commits, "default" keeps SQLite's rollback journal
+    SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "wal")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_MB = int(os.getenv("SQLITE_MMAP_MB", "256"))
+    SQLITE_CACHE_MB = int(os.getenv("SQLITE_CACHE_MB", "64"))
+    # Connection pool per engine; 10 + 30 overflow matches FastAPI's 40 worker threads
+    SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "10"))
+    SQLITE_MAX_OVERFLOW = int(os.getenv("SQLITE_MAX_OVERFLOW", "30"))
+
+    # Number of serialized /api/workflows responses kept in memory
+    API_CACHE_SIZE = int(os.getenv("API_CACHE_SIZE", "128"))
+
+    # Weight of every platform in the composite popularity score
+    RANKING_WEIGHTS = {"youtube": 0.4, "forum": 0.3, "google": 0.3}
+
+    # Google Trends history: growth compares the last N days with the N days before,
+    # incremental fetches re-download an overlap to rescale new points onto the stored ones
+    TRENDS_GROWTH_WINDOW_DAYS = int(os.getenv("TRENDS_GROWTH_WINDOW_DAYS", "30"))
+    TRENDS_INTEREST_DAYS = 90
+    TRENDS_OVERLAP_DAYS = 14
+    # Beyond this gap a full 3-month series is downloaded again (Google switches to weekly data past ~270 days)
+    TRENDS_MAX_GAP_DAYS = 180
+
+    # Batched Trends mode: 4 keywords + 1 shared anchor term per request (pytrends max is 5).
+    # Every batch is rescaled so the anchor averages 100, keeping batches comparable.
+    TRENDS_BATCH_SIZE = 4
+    TRENDS_ANCHOR_TERM = os.getenv("TRENDS_ANCHOR_TERM", "n8n workflow")
+
+    # Unified harvest scheduler (jobs/scheduler.py): one worker per source, each with
+    # its own daily quota (provider units), cycle interval and keywords per cycle.
+    # Request pacing comes from SOURCE_PACING, shared with the standalone jobs.
+    YOUTUBE_SEARCH_COST = 100      # quota units per search().list
+    YOUTUBE_VIDEOS_LIST_COST = 1   # quota units per videos().list
+    SCHEDULER_SOURCES = {
+        "youtube": {"daily_quota": 10000, "interval_seconds": 60, "keywords_per_cycle": 5},
+        "forum": {"daily_quota": 5000, "interval_seconds": 60, "keywords_per_cycle": 10},
+        "google": {"daily_quota": 400, "interval_seconds": 30, "keywords_per_cycle": 4},
+    }
+
+    # Near-duplicate titles (shingle Jaccard similarity) share a cluster_id
+    DEDUP_SIMILARITY = float(os.getenv("DEDUP_SIMILARITY", "0.7"))
+
+    # Metric history: raw snapshots older than this are rolled up to weekly aggregates
+    SNAPSHOT_RETENTION_DAYS = int(os.getenv("SNAPSHOT_RETENTION_DAYS", "30"))
+
+    # Harvest checkpoints: units completed within this window are skipped (0 disables)
+    HARVEST_FRESHNESS_HOURS = float(os.getenv("HARVEST_FRESHNESS_HOURS", "6"))
+
     # Define a reliable root path (Pathlib is more modern than os.path)
     BASE_DIR = Path(__file__).resolve().parent.parent.parent
+    FORUM_HTTP_CACHE_PATH = BASE_DIR / "data" / "http_cache.db"
+    # Per-run metric summaries written by the harvest jobs
+    RUN_SUMMARY_DIR = BASE_DIR / "data" / "run_summaries"
 
     @staticmethod
     def get_keywords():
@@ -0,0 +1,137 @@
+import sqlite3
+import threading
+import time
+from app.utils.config import Config
+
+class HttpCache:
+    """
+    Persistent HTTP response cache backed by its own SQLite file.
+
+    Stores the body together with its ETag / Last-Modified validators (for
+    conditional GETs) and an optional application freshness token, such as
+    a forum topic's last_posted_at. The least recently used entries are
+    evicted once the cache grows past `max_bytes`.
+
+    Lookups never commit: their last_access touches are kept in memory and
+    written by flush() (called per harvest, on eviction and on close). The
+    file runs in WAL mode with synchronous=NORMAL, so a store is a cheap
+    append instead of an fsync.
+    """
+
+    # Pending last_access touches that force a flush from get()
+    MAX_PENDING_TOUCHES = 500
+
+    def __init__(self, path, max_bytes: int):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # url -> time of the last lookup, not yet written
+        self._touched = {}
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                freshness_token TEXT,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_responses_last_access ON responses (last_access)")
+        self._conn.commit()
+        # Running total, so stores don't SUM the whole table
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @classmethod
+    def from_config(cls):
+        """The shared forum cache, or None when disabled (FORUM_HTTP_CACHE_MB=0)."""
+        if Config.FORUM_HTTP_CACHE_MB <= 0:
+            return None
+        Config.FORUM_HTTP_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        return cls(Config.FORUM_HTTP_CACHE_PATH, int(Config.FORUM_HTTP_CACHE_MB * 1024 * 1024))
+
+    def get(self, url: str):
+        """Returns the cached entry as a dict (and marks it recently used), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, freshness_token FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._touched[url] = time.time()
+            if len(self._touched) >= self.MAX_PENDING_TOUCHES:
+                self._flush_touches()
+                self._conn.commit()
+        body, etag, last_modified, freshness_token = row
+        return {"body": body, "etag": etag, "last_modified": last_modified, "freshness_token": freshness_token}
+
+    def conditional_headers(self, entry) -> dict:
+        """Validators to send so the server can answer 304 Not Modified."""
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url: str, body: bytes, etag=None, last_modified=None, freshness_token=None):
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self._total_bytes += len(body) - (old[0] if old else 0)
+            self._touched.pop(url, None)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, body, size, etag, last_modified, freshness_token, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, body, len(body), etag, last_modified, freshness_token, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, url: str, freshness_token=None):
+        """Marks an entry revalidated by a 304 response."""
+        with self._lock:
+            self._touched.pop(url, None)
+            self._conn.execute(
+                "UPDATE responses SET last_access = ?, freshness_token = COALESCE(?, freshness_token) WHERE url = ?",
+                (time.time(), freshness_token, url),
+            )
+            self._conn.commit()
+
+    def flush(self):
+        """Writes the pending last_access touches in one transaction."""
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+
+    def _flush_touches(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE responses SET last_access = ? WHERE url = ?",
+                [(accessed, url) for url, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _evict(self):
+        if self._total_bytes <= self.max_bytes:
+            return
+        # LRU order needs the recent lookups on disk
+        self._flush_touches()
+        # Walk entries from least to most recently used until we are under budget
+        doomed = []
+        for url, size in self._conn.execute("SELECT url, size FROM responses ORDER BY last_access"):
+            if self._total_bytes <= self.max_bytes:
+                break
+            doomed.append((url,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE url = ?", doomed)
+
+    def close(self):
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,37 @@
+import importlib.util
+from app.utils.config import Config
+
+# requests and httpx are imported by the helpers themselves: each process
+# loads only the client it uses (the Trends job never needs httpx)
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+def pooled_session(headers=None, pool_size: int = Config.HTTP_POOL_SIZE) -> "requests.Session":
+    """
+    requests.Session keeping up to `pool_size` connections per host alive,
+    so consecutive calls skip the TCP and TLS handshakes. requests
+    negotiates gzip by default.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(headers or {})
+    return session
+
+def async_client(headers=None, pool_size: int = Config.HTTP_POOL_SIZE, timeout: float = 10) -> "httpx.AsyncClient":
+    """httpx.AsyncClient with a bounded keep-alive pool, over HTTP/2 when available."""
+    import httpx
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=timeout,
+        http2=Config.HTTP2_ENABLED and HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_connections=pool_size,
+            max_keepalive_connections=pool_size,
+            keepalive_expiry=Config.HTTP_KEEPALIVE_SECONDS,
+        ),
+    )
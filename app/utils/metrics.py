@@ -0,0 +1,241 @@
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Latency buckets in seconds: 1 ms .. 60 s
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelnames=()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def samples(self):
+        with self._lock:
+            return dict(self._values)
+
+class Histogram:
+    """Bucketed distribution of observed values (durations, sizes), split by labels."""
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # key -> [bucket counts..., count, sum, max]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labelnames)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0, 0.0, 0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-3] += 1
+            state[-2] += value
+            state[-1] = max(state[-1], value)
+
+    @contextmanager
+    def time(self, **labels):
+        """Observes the wall time of the with-block, also when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self):
+        with self._lock:
+            return {key: list(state) for key, state in self._values.items()}
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, description, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, description, labelnames, **kwargs)
+            return metric
+
+    def counter(self, name: str, description: str, labelnames=()) -> Counter:
+        return self._get_or_create(Counter, name, description, labelnames)
+
+    def histogram(self, name: str, description: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, description, labelnames, buckets=buckets)
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for key, value in sorted(metric.samples().items()):
+                labels = list(zip(metric.labelnames, key))
+                if metric.kind == "counter":
+                    lines.append(f"{metric.name}{_labels(labels)} {_number(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(metric.buckets, value):
+                    cumulative += count
+                    lines.append(f"{metric.name}_bucket{_labels(labels + [('le', _number(bound))])} {cumulative}")
+                lines.append(f"{metric.name}_bucket{_labels(labels + [('le', '+Inf')])} {value[-3]}")
+                lines.append(f"{metric.name}_sum{_labels(labels)} {_number(value[-2])}")
+                lines.append(f"{metric.name}_count{_labels(labels)} {value[-3]}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> dict:
+        """Plain dict of every series, for the per-run job summaries."""
+        result = {}
+        for metric in list(self._metrics.values()):
+            series = {}
+            for key, value in sorted(metric.samples().items()):
+                label = ",".join(f"{n}={v}" for n, v in zip(metric.labelnames, key)) or "total"
+                if metric.kind == "counter":
+                    series[label] = value
+                else:
+                    count, total, peak = value[-3], value[-2], value[-1]
+                    series[label] = {
+                        "count": count,
+                        "sum_s": round(total, 4),
+                        "avg_ms": round(total / count * 1000, 2) if count else 0.0,
+                        "max_ms": round(peak * 1000, 2),
+                    }
+            if series:
+                result[metric.name] = series
+        return result
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+# Process-wide registry: the API serves it at /metrics, jobs dump it per run
+REGISTRY = Registry()
+
+def timed(histogram: Histogram, **labels):
+    """Decorator observing every call's duration in `histogram`."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with histogram.time(**labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def status_code(exc: Exception):
+    """HTTP status of a googleapiclient, requests, httpx or pytrends error (None without a response)."""
+    status = getattr(getattr(exc, "resp", None), "status", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return int(status) if status is not None else None
+
+def is_rate_limited(exc: Exception) -> bool:
+    """429 / quota errors from googleapiclient, requests, httpx or pytrends."""
+    # Classified by status only: error messages contain URLs and ids (/t/14291.json)
+    status = status_code(exc)
+    if status == 429:
+        return True
+    # YouTube reports an exhausted daily quota as 403 quotaExceeded
+    return status == 403 and "quota" in str(exc).lower()
+
+@contextmanager
+def track_request(source: str, endpoint: str):
+    """Times one upstream request and counts it as ok, error or rate_limited."""
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except Exception as e:
+        outcome = "rate_limited" if is_rate_limited(e) else "error"
+        raise
+    finally:
+        HARVEST_REQUEST_SECONDS.observe(time.perf_counter() - start, source=source, endpoint=endpoint)
+        HARVEST_REQUESTS.inc(source=source, outcome=outcome)
+
+def write_run_summary(path) -> list:
+    """
+    Dumps the registry as JSON (one file per job run) and returns
+    human-readable lines for the job log.
+    """
+    summary = REGISTRY.summary()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+    lines = []
+    for name, series in summary.items():
+        for label, value in series.items():
+            if isinstance(value, dict):
+                value = f"{value['count']} calls, avg {value['avg_ms']} ms, max {value['max_ms']} ms"
+            lines.append(f"{name}{{{label}}}: {value}")
+    return lines
+
+# --- Metrics shared across the services, jobs and API ---
+
+HARVEST_REQUEST_SECONDS = REGISTRY.histogram(
+    "harvest_request_seconds", "Latency of single upstream API requests", ("source", "endpoint"),
+)
+HARVEST_REQUESTS = REGISTRY.counter(
+    "harvest_requests_total", "Upstream API requests by outcome (ok, error, rate_limited)", ("source", "outcome"),
+)
+HARVEST_FETCH_SECONDS = REGISTRY.histogram(
+    "harvest_fetch_seconds", "Duration of a service fetch (search plus detail requests)", ("source", "operation"),
+)
+HARVEST_RETRIES = REGISTRY.counter(
+    "harvest_retries_total", "Upstream requests retried after a failure", ("source", "reason"),
+)
+CIRCUIT_OPENED = REGISTRY.counter(
+    "circuit_opened_total", "Circuit breaker trips per upstream host", ("source", "host"),
+)
+QUOTA_UNITS_SPENT = REGISTRY.counter(
+    "quota_units_spent_total", "Provider quota units consumed", ("source",),
+)
+DB_UPSERT_SECONDS = REGISTRY.histogram(
+    "db_upsert_seconds", "Duration of bulk workflow upserts (including commit)",
+)
+DB_ROWS_WRITTEN = REGISTRY.counter(
+    "db_rows_written_total", "Workflow rows written by the upsert", ("result",),
+)
+API_REQUEST_SECONDS = REGISTRY.histogram(
+    "api_request_seconds", "API handler latency", ("method", "route", "status"),
+)
+API_SERIALIZE_SECONDS = REGISTRY.histogram(
+    "api_serialize_seconds", "Time spent rendering response bodies", ("handler",),
+)
+API_CACHE_LOOKUPS = REGISTRY.counter(
+    "api_cache_lookups_total", "Response cache lookups by result (hit, miss)", ("result",),
+)
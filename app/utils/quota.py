@@ -0,0 +1,51 @@
+import datetime
+import threading
+from sqlalchemy.dialects.sqlite import insert
+from app.models.quota_usage import QuotaUsage
+
+class QuotaBudget:
+    """
+    Daily API quota (in the provider's own units) shared by one harvest worker.
+    The budget refills at midnight UTC, like the YouTube Data API quota.
+    The day's spend is stored in the quota_usage table, so restarts don't
+    hand out the full quota again.
+    """
+
+    def __init__(self, name: str, daily_units: int, session_factory):
+        self.name = name
+        self.daily_units = daily_units
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+
+    def _spent(self, db, day) -> int:
+        usage = db.get(QuotaUsage, (self.name, day))
+        return usage.units if usage else 0
+
+    def _add(self, db, day, units: int):
+        stmt = insert(QuotaUsage).values(source=self.name, day=day, units=units)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=["source", "day"],
+            set_={"units": QuotaUsage.units + stmt.excluded.units},
+        ))
+        db.commit()
+
+    @property
+    def remaining(self) -> int:
+        with self._lock, self.session_factory() as db:
+            return self.daily_units - self._spent(db, datetime.datetime.utcnow().date())
+
+    def try_spend(self, units: int) -> bool:
+        """Reserves `units` if the budget allows it; returns False otherwise."""
+        with self._lock, self.session_factory() as db:
+            today = datetime.datetime.utcnow().date()
+            if self._spent(db, today) + units > self.daily_units:
+                return False
+            self._add(db, today, units)
+            return True
+
+    def reconcile(self, reserved: int, spent: int):
+        """Replaces a reservation with the units the harvest actually used."""
+        if spent == reserved:
+            return
+        with self._lock, self.session_factory() as db:
+            self._add(db, datetime.datetime.utcnow().date(), spent - reserved)
@@ -0,0 +1,52 @@
+import asyncio
+import threading
+import time
+
+
+class AdaptiveRateLimiter:
+    """
+    AIMD request pacing for one upstream source, shared by its threads and
+    asyncio tasks alike.
+    Requests are spaced 1 / rate seconds apart. Every success raises the
+    rate by `step` (additive increase, up to `max_rate`); a throttled
+    request divides it by 2 (multiplicative decrease, down to `min_rate`),
+    and a Retry-After holds every caller back until it has passed.
+    """
+
+    def __init__(self, rate: float, min_rate: float = None, max_rate: float = None, step: float = 0.0, decrease: float = 0.5):
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self.step = step
+        self.decrease = decrease
+        # Earliest start of the next request
+        self._next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Books the next free slot and returns the seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1 / self.rate
+            return slot - now
+
+    def acquire(self):
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.step)
+
+    def on_throttle(self, retry_after: float = None):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            if retry_after:
+                self._next_slot = max(self._next_slot, time.monotonic() + retry_after)
@@ -0,0 +1,223 @@
+import asyncio
+import email.utils
+import random
+import sys
+import threading
+import time
+from app.utils.config import Config
+from app.utils.metrics import CIRCUIT_OPENED, HARVEST_RETRIES, is_rate_limited, status_code
+from app.utils.rate_limiter import AdaptiveRateLimiter
+
+# Transient answers worth another attempt; any other status is final
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host whose circuit breaker is open."""
+
+def retry_after_seconds(exc: Exception):
+    """Seconds requested by the Retry-After header of an error response, or None."""
+    # googleapiclient keeps the lower-cased headers on exc.resp, requests/httpx on exc.response.headers
+    headers = getattr(exc, "resp", None)
+    if headers is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+    if headers is None:
+        return None
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    # HTTP-date form
+    try:
+        return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+def is_retryable(exc: Exception) -> bool:
+    """Throttling, 5xx answers and transport failures (refused, reset, timed out)."""
+    if is_rate_limited(exc):
+        # An exhausted daily quota (YouTube 403 quotaExceeded) only refills at midnight
+        return status_code(exc) != 403
+    status = status_code(exc)
+    if status is not None:
+        return status in RETRY_STATUSES
+    # requests' exceptions derive from OSError, like socket and SSL errors
+    if isinstance(exc, OSError):
+        return True
+    # httpx is not imported here: only the processes using the async forum client load it
+    httpx = sys.modules.get("httpx")
+    return httpx is not None and isinstance(exc, httpx.TransportError)
+
+class CircuitBreaker:
+    """
+    Stops calling a host after `failure_threshold` consecutive failures.
+    After `reset_seconds` a single probe request is let through: its success
+    closes the circuit, its failure opens it for another period. A probe
+    cancelled before the host answered gives its slot back.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = "half_open"
+                return True
+            return False
+
+    def release_probe(self):
+        """Back to open after an unanswered probe; its reset period is over, so the next call probes."""
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+
+    def record_failure(self) -> bool:
+        """Counts a failure; returns True when it opened the circuit."""
+        with self._lock:
+            self._failures += 1
+            if self.state == "half_open" or (self.state == "closed" and self._failures >= self.failure_threshold):
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+class SourceResilience:
+    """
+    Retry, pacing and circuit-breaking policy of one upstream source.
+
+    call() / call_async() run a request function through it: wait for the
+    source's adaptive rate limiter, refuse hosts with an open circuit, and
+    retry transient failures with exponential backoff and full jitter (or
+    the server's Retry-After). The error of the last attempt is raised.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        limiter: AdaptiveRateLimiter,
+        max_attempts: int = Config.HTTP_MAX_ATTEMPTS,
+        backoff_base: float = Config.HTTP_BACKOFF_BASE_SECONDS,
+        backoff_max: float = Config.HTTP_BACKOFF_MAX_SECONDS,
+        max_retry_after: float = Config.HTTP_MAX_RETRY_AFTER_SECONDS,
+    ):
+        self.source = source
+        self.limiter = limiter
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_after = max_retry_after
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(Config.CIRCUIT_FAILURE_THRESHOLD, Config.CIRCUIT_RESET_SECONDS)
+            return self._breakers[host]
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: uniform in [0, min(cap, base * 2^attempt)]."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _before_attempt(self, host: str) -> bool:
+        """Raises when the circuit refuses the call; returns True for the half-open probe."""
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {host}, not calling it for now")
+        return breaker.state == "half_open"
+
+    def _after_interrupt(self, host: str, probe: bool):
+        """A cancelled or interrupted attempt says nothing about the host; free the probe slot."""
+        if probe:
+            self.breaker(host).release_probe()
+
+    def _after_success(self, host: str):
+        self.breaker(host).record_success()
+        self.limiter.on_success()
+
+    def _after_failure(self, host: str, exc: Exception, attempt: int) -> float:
+        """Updates pacing and the breaker; returns the delay before the next attempt or re-raises."""
+        retryable = is_retryable(exc)
+        retry_after = retry_after_seconds(exc)
+        if is_rate_limited(exc):
+            # The host is up but wants fewer requests: slow the whole source down.
+            # Longer pauses fail this call below; holding every caller back that long would hang the jobs.
+            self.limiter.on_throttle(min(retry_after, self.max_retry_after) if retry_after is not None else None)
+            self.breaker(host).record_success()
+        elif not retryable:
+            # A definitive answer (404, 403...) still proves the host is healthy
+            self.breaker(host).record_success()
+        elif self.breaker(host).record_failure():
+            CIRCUIT_OPENED.inc(source=self.source, host=host)
+            print(f"🔌 Circuit opened for {host} after repeated failures")
+
+        if not retryable or attempt + 1 >= self.max_attempts:
+            raise exc
+        if retry_after is not None and retry_after > self.max_retry_after:
+            raise exc
+        HARVEST_RETRIES.inc(source=self.source, reason=str(status_code(exc) or type(exc).__name__))
+        return retry_after if retry_after is not None else self.backoff(attempt)
+
+    def call(self, host: str, fn):
+        """Runs fn() with pacing and retries; for the synchronous clients."""
+        attempt = 0
+        while True:
+            probe = self._before_attempt(host)
+            try:
+                self.limiter.acquire()
+                result = fn()
+            except Exception as e:
+                time.sleep(self._after_failure(host, e, attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                # KeyboardInterrupt, SystemExit...
+                self._after_interrupt(host, probe)
+                raise
+            self._after_success(host)
+            return result
+
+    async def call_async(self, host: str, fn):
+        """Awaits fn() with pacing and retries; for the asyncio clients."""
+        attempt = 0
+        while True:
+            probe = self._before_attempt(host)
+            try:
+                await self.limiter.acquire_async()
+                result = await fn()
+            except Exception as e:
+                await asyncio.sleep(self._after_failure(host, e, attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                # asyncio.CancelledError (e.g. a sibling task failed), KeyboardInterrupt...
+                self._after_interrupt(host, probe)
+                raise
+            self._after_success(host)
+            return result
+
+# One policy per source, shared by every service instance and thread of the process
+_SOURCES = {}
+_SOURCES_LOCK = threading.Lock()
+
+def resilience_for(source: str) -> SourceResilience:
+    """The process-wide SourceResilience of a source, paced by Config.SOURCE_PACING."""
+    with _SOURCES_LOCK:
+        if source not in _SOURCES:
+            _SOURCES[source] = SourceResilience(source, AdaptiveRateLimiter(**Config.SOURCE_PACING[source]))
+        return _SOURCES[source]
@@ -0,0 +1,155 @@
+"""
+Load test of /api/workflows: sync threadpool handler vs. async aiosqlite handler.
+
+    python -m benchmarks.bench_api_load --concurrency 50 100 250 500 --requests 3000
+
+Seeds a throwaway SQLite file, serves both paths from one uvicorn process
+(the old `def` handler on a sync Session under /sync, the real router under
+/async) and replays the same mix of page requests against each with N
+concurrent keep-alive clients. The response cache is disabled so every
+request reaches SQLite. Reports p50/p99 latency and requests/sec.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+import httpx
+import numpy as np
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from app.api import workflows
+from app.api.cache import ResponseCache
+from app.database.db import create_async_sqlite_engine, create_sqlite_engine, get_async_db
+from app.database.versioning import get_data_version
+from benchmarks.fixtures import generate_workflows
+
+# Page requests replayed by every client, round robin
+REQUEST_MIX = [
+    "/workflows?limit=50",
+    "/workflows?platform=youtube&limit=50&order_by=views",
+    "/workflows?platform=forum&limit=100&order_by=replies",
+    "/workflows?platform=google&country=US&limit=20",
+    "/workflows?country=IN&limit=200&fields=views,likes",
+]
+
+def build_app() -> FastAPI:
+    """uvicorn factory: both handler flavours over the database in BENCH_API_DB."""
+    path = os.environ["BENCH_API_DB"]
+    SyncSession = sessionmaker(bind=create_sqlite_engine(f"sqlite:///{path}"))
+    AsyncSession = async_sessionmaker(create_async_sqlite_engine(f"sqlite+aiosqlite:///{path}"), expire_on_commit=False)
+    workflows.response_cache = ResponseCache(maxsize=0)
+
+    app = FastAPI()
+
+    async def bench_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    def bench_sync_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_async_db] = bench_async_db
+    app.include_router(workflows.router, prefix="/async")
+
+    @app.get("/sync/workflows", response_model=None)
+    def sync_read_workflows(
+        platform: Optional[str] = None,
+        country: Optional[str] = None,
+        limit: Optional[int] = None,
+        order_by: str = "id",
+        fields: Optional[str] = None,
+        db=Depends(bench_sync_db),
+    ):
+        # The previous read_workflows: a `def` endpoint on a sync Session
+        field_set, position = workflows._parse_page_request(order_by, fields, None)
+        version = get_data_version(db)
+        stmt = workflows._page_statement(platform, country, limit, position, order_by, field_set)
+        results = db.execute(stmt).all()
+        body, headers = workflows._render_page(results, limit, order_by, field_set)
+        entry = workflows.response_cache.put(None, version, body, headers)
+        return workflows._conditional_response(entry, None)
+
+    return app
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_until_ready(base_url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/async/health").status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("benchmark server did not start")
+
+async def load(base_url: str, concurrency: int, total: int):
+    """Returns (latencies in seconds, wall time) for `total` requests over `concurrency` clients."""
+    latencies = []
+    counter = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120) as client:
+
+        async def worker():
+            for i in counter:
+                start = time.perf_counter()
+                resp = await client.get(REQUEST_MIX[i % len(REQUEST_MIX)])
+                resp.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies, time.perf_counter() - start
+
+def report(path: str, concurrency: int, latencies, elapsed: float):
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"{path:>6} | {concurrency:>4} clients | p50 {p50:8.1f} ms  p99 {p99:8.1f} ms  "
+          f"{len(latencies) / elapsed:8.1f} req/s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 100, 250, 500])
+    parser.add_argument("--requests", type=int, default=3000, help="Requests per path and concurrency level")
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        generate_workflows(db_path, args.rows, args.seed)
+
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "--factory", "benchmarks.bench_api_load:build_app",
+             "--port", str(port), "--log-level", "warning", "--no-access-log"],
+            env={**os.environ, "BENCH_API_DB": db_path},
+        )
+        try:
+            wait_until_ready(base_url)
+            print(f"{args.rows:,} rows, {args.requests:,} requests per run")
+            for concurrency in args.concurrency:
+                for path in ("sync", "async"):
+                    latencies, elapsed = asyncio.run(load(f"{base_url}/{path}", concurrency, args.requests))
+                    report(path, concurrency, latencies, elapsed)
+        finally:
+            server.terminate()
+            server.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Forum harvest: sequential ForumService vs. concurrent AsyncForumService.
+
+    python -m benchmarks.bench_forum_harvest --keywords 30 --latency 0.05
+
+Harvests the same keywords from the local Discourse stub twice per
+harvester, each with its own empty HTTP cache:
+  cold  every topic is downloaded
+  warm  unchanged topics come from the cache, the rest are revalidated
+Checks that both harvesters produce exactly the same rows in both passes
+(exits with status 1 otherwise), then reports their wall time and requests.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from app.services.async_forum_service import AsyncForumService
+from app.services.forum_service import ForumService
+from app.utils.http_cache import HttpCache
+from app.utils.rate_limiter import AdaptiveRateLimiter
+from app.utils.resilience import SourceResilience
+from benchmarks.fixtures import DiscourseStub
+
+def unpaced() -> SourceResilience:
+    """Retry policy without pacing: compares the harvesters, not the politeness budget."""
+    return SourceResilience("forum", AdaptiveRateLimiter(rate=1_000_000))
+
+def harvest_sequential(service, keywords):
+    return {keyword: service.fetch_workflow_data(keyword) for keyword in keywords}
+
+def harvest_concurrent(service, keywords):
+    return service.fetch_all(keywords)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keywords", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated server time per request (seconds)")
+    args = parser.parse_args()
+    keywords = [f"workflow keyword {i}" for i in range(args.keywords)]
+
+    with tempfile.TemporaryDirectory() as tmp, DiscourseStub(latency=args.latency) as stub:
+        def cache(name):
+            return HttpCache(os.path.join(tmp, f"{name}.db"), max_bytes=64 * 1024 * 1024)
+
+        harvesters = [
+            ("ForumService", ForumService(stub.url, http_cache=cache("sync"), resilience=unpaced()), harvest_sequential),
+            ("AsyncForumService", AsyncForumService(stub.url, http_cache=cache("async"), resilience=unpaced()), harvest_concurrent),
+        ]
+
+        print(f"{len(keywords)} keywords, {args.latency * 1000:.0f} ms simulated latency")
+        rows = {}
+        for name, service, harvest in harvesters:
+            for run in ("cold", "warm"):
+                before = stub.hits["search"] + stub.hits["topic"]
+                start = time.perf_counter()
+                rows[name, run] = harvest(service, keywords)
+                seconds = time.perf_counter() - start
+                requests = stub.hits["search"] + stub.hits["topic"] - before
+                found = sum(len(results) for results in rows[name, run].values())
+                print(f"{name:>18} {run} | {seconds * 1000:8.1f} ms  {requests:4} requests  {found:4} rows")
+            service.http_cache.close()
+
+    failures = [
+        run for run in ("cold", "warm")
+        if rows["ForumService", run] != rows["AsyncForumService", run]
+    ]
+    if failures:
+        print(f"❌ Harvesters disagree on the rows ({', '.join(failures)} pass)")
+        sys.exit(1)
+    print("✅ Both harvesters produced the same rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Forum HTTP layer: a new connection per request vs. pooled keep-alive clients, over TLS.
+
+    python -m benchmarks.bench_http_pool --requests 300
+
+Serves the Discourse stub over HTTPS on localhost and fetches the same
+topic URLs one after another through:
+  requests.get     the previous ForumService: new TCP + TLS connection per call
+  pooled_session   ForumService's keep-alive requests.Session
+  httpx oneshot    a fresh httpx client per request
+  async_client     AsyncForumService's pooled client (HTTP/2 when h2 is installed)
+Reports per-request latency and the connections the server accepted.
+On localhost a handshake costs CPU only; over the internet each one also
+costs 2-3 round trips to community.n8n.io.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+import httpx
+import requests
+from app.utils.http_pool import HTTP2_AVAILABLE, async_client, pooled_session
+from benchmarks.fixtures import DiscourseStub
+
+def run_sync(get, urls):
+    timings = []
+    for url in urls:
+        start = time.perf_counter()
+        get(url).raise_for_status()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+async def run_async(get, urls):
+    timings = []
+    for url in urls:
+        start = time.perf_counter()
+        (await get(url)).raise_for_status()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated server time per request (seconds)")
+    args = parser.parse_args()
+
+    with DiscourseStub(latency=args.latency, tls=True) as stub:
+        # Both clients read the trust store from the environment
+        os.environ["SSL_CERT_FILE"] = os.environ["REQUESTS_CA_BUNDLE"] = stub.cert_path
+        urls = [f"{stub.url}/t/{i % stub.topic_pool + 1}.json" for i in range(args.requests)]
+
+        async def httpx_oneshot(url):
+            async with httpx.AsyncClient() as client:
+                return await client.get(url)
+
+        async def pooled_async():
+            async with async_client() as client:
+                return await run_async(client.get, urls)
+
+        session = pooled_session()
+        runs = [
+            ("requests.get", lambda: run_sync(requests.get, urls)),
+            ("pooled_session", lambda: run_sync(session.get, urls)),
+            ("httpx oneshot", lambda: asyncio.run(run_async(httpx_oneshot, urls))),
+            (f"async_client ({'h2' if HTTP2_AVAILABLE else 'h1.1'})", lambda: asyncio.run(pooled_async())),
+        ]
+
+        print(f"{args.requests} HTTPS requests, one at a time")
+        baseline = None
+        for name, run in runs:
+            before = stub.hits["connections"]
+            timings = run()
+            connections = stub.hits["connections"] - before
+            mean = statistics.mean(timings) * 1000
+            baseline = baseline or mean
+            print(
+                f"{name:>22} | mean {mean:6.2f} ms  p50 {statistics.median(timings) * 1000:6.2f} ms"
+                f"  {connections:4} connections  saves {baseline - mean:5.2f} ms/request"
+            )
+        session.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Import-time budget of the API and job entry points.
+
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --budget-scale 2 --top 8
+
+Imports each entry point in a fresh interpreter (what a uvicorn worker or a
+cron-triggered job pays before doing any work) and checks that:
+  - the median import time stays within the entry point's budget
+  - none of the heavy packages it does not use got loaded
+    (e.g. the API must not pull in googleapiclient, pytrends or pandas)
+Exits with status 1 when a check fails, so it can gate CI. Budgets were set
+on a laptop-class CPU; use --budget-scale on slower machines.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# entry point -> (budget in ms, packages it must not import)
+ENTRY_POINTS = {
+    "app.main": (500, ["googleapiclient", "pytrends", "pandas", "apscheduler", "requests", "httpx", "uvicorn"]),
+    "jobs.update_youtube": (500, ["pytrends", "pandas", "apscheduler", "requests", "httpx"]),
+    "jobs.update_forum": (500, ["googleapiclient", "pytrends", "pandas", "apscheduler", "httpx"]),
+    "jobs.update_trends": (700, ["googleapiclient", "apscheduler", "httpx"]),
+    "jobs.scheduler": (700, ["googleapiclient"]),
+}
+
+# Runs in the child interpreter: time one import, report it with the loaded top-level packages
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"ms": elapsed * 1000, "modules": sorted({{m.split(".")[0] for m in sys.modules}})}}))
+"""
+
+def run_probe(module: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module)],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    # The modules may log while importing; the report is the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def heaviest_imports(module: str, top: int):
+    """Top-level packages by cumulative import time, from python -X importtime."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        cumulative[package] = max(cumulative.get(package, 0), int(cum))
+    cumulative.pop(module.split(".")[0], None)
+    return sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=list(ENTRY_POINTS), help="entry points to check")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per entry point")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="multiplies every budget")
+    parser.add_argument("--top", type=int, default=0, help="also list the N heaviest imported packages")
+    args = parser.parse_args()
+
+    failures = []
+    for module in args.modules:
+        budget, forbidden = ENTRY_POINTS.get(module, (None, []))
+        probes = [run_probe(module) for _ in range(args.repeat)]
+        median = statistics.median(probe["ms"] for probe in probes)
+        loaded = sorted(set(forbidden) & set(probes[0]["modules"]))
+
+        limit = budget * args.budget_scale if budget else None
+        over = limit is not None and median > limit
+        status = "❌" if over or loaded else "✅"
+        print(f"{status} {module:<22} {median:7.1f} ms" + (f"  (budget {limit:.0f} ms)" if limit else ""))
+        if over:
+            failures.append(f"{module} imports in {median:.0f} ms, over its {limit:.0f} ms budget")
+        if loaded:
+            failures.append(f"{module} loads {', '.join(loaded)}")
+
+        for package, microseconds in heaviest_imports(module, args.top) if args.top else []:
+            print(f"     {package:<24} {microseconds / 1000:7.1f} ms")
+
+    if failures:
+        print("\n" + "\n".join(f"  - {failure}" for failure in failures))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Title search: FTS5 index vs. LIKE '%...%' scan.
+
+    python -m benchmarks.bench_search --rows 1000000
+
+Seeds a throwaway SQLite file with synthetic titles, builds the search
+index the way upgrade_schema does and times a few user queries both ways
+(median of --repeat runs, top 20 results). LIKE can stop early on
+frequent words; rare or missing words force it through the whole table.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from sqlalchemy import create_engine, insert, text
+from app.database.migrations import upgrade_schema
+from app.database.search_index import match_expression, search_statement
+from app.models.workflow import Workflow
+
+# Title words: a few common integration names plus a long tail of rare
+# tokens, so queries are as selective as on real harvested titles
+COMMON_WORDS = (
+    "slack gmail whatsapp telegram notion airtable hubspot stripe shopify openai agent crm "
+    "sheets google drive discord invoice lead email chatbot webhook automation report"
+).split()
+RARE_WORDS = [f"tok{i}" for i in range(50_000)]
+
+QUERIES = ["slack", "whatsapp crm", "goo", "tok123", "tok4242 tok77", "zendesk"]
+
+def seed_titles(engine, rows: int, seed: int):
+    rng = random.Random(seed)
+    with engine.begin() as conn:
+        for start in range(0, rows, 50_000):
+            conn.execute(insert(Workflow), [
+                {
+                    "workflow_name": " ".join(
+                        rng.sample(COMMON_WORDS, 2) + rng.sample(RARE_WORDS, rng.randint(2, 5))
+                    ) + f" #{i}",
+                    "platform": "youtube",
+                    "country": "US",
+                    "api_json": "{}",
+                }
+                for i in range(start, min(start + 50_000, rows))
+            ])
+
+def median_ms(conn, stmt, params, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(stmt, params).all()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'search.db')}")
+        upgrade_schema(engine)
+        seed_titles(engine, args.rows, args.seed)
+        start = time.perf_counter()
+        upgrade_schema(engine)  # indexes the new titles
+        print(f"{args.rows:,} titles, index built in {time.perf_counter() - start:.1f}s")
+
+        with engine.connect() as conn:
+            for query in QUERIES:
+                words = query.split()
+                # What the API would do without the index: every word as a substring
+                like = text("SELECT id, api_json FROM workflows WHERE " + " AND ".join(
+                    f"lower(workflow_name) LIKE :w{i}" for i in range(len(words))
+                ) + " LIMIT 20")
+                like_params = {f"w{i}": f"%{word}%" for i, word in enumerate(words)}
+                fts_ms = median_ms(conn, search_statement(), {"match": match_expression(query), "limit": 20}, args.repeat)
+                like_ms = median_ms(conn, like, like_params, args.repeat)
+                print(f"{query!r:>22} | fts5 {fts_ms:8.2f} ms  like {like_ms:9.2f} ms  x{like_ms / fts_ms:,.1f}")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
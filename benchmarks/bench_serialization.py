@@ -0,0 +1,94 @@
+"""
+/api/workflows serialization: per-request to_dict() vs. JSON stored at write time.
+
+    python -m benchmarks.bench_serialization --rows 100000 --repeat 5
+
+Seeds a throwaway SQLite file and fetches the whole table in-process
+(ASGI, no network) through:
+  to_dict   the previous read path: ORM objects + to_dict() + json.dumps
+  api_json  the current handler, joining the pre-serialized rows
+  fields    the current handler with ?fields=, rendered from column rows
+The response cache is disabled so every request reaches SQLite.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+import httpx
+from fastapi import Depends, FastAPI, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import selectinload
+from app.api import workflows
+from app.api.cache import ResponseCache
+from app.database.db import create_async_sqlite_engine, get_async_db
+from app.models.workflow import Workflow
+from benchmarks.fixtures import generate_workflows
+
+def build_app(path: str) -> FastAPI:
+    AsyncSession = async_sessionmaker(create_async_sqlite_engine(f"sqlite+aiosqlite:///{path}"), expire_on_commit=False)
+    workflows.response_cache = ResponseCache(maxsize=0)
+
+    app = FastAPI()
+
+    async def bench_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = bench_async_db
+    app.include_router(workflows.router, prefix="/api")
+
+    @app.get("/legacy/workflows", response_model=None)
+    async def legacy_read_workflows(db=Depends(bench_async_db)):
+        stmt = select(Workflow).options(
+            selectinload(Workflow.youtube_metrics), selectinload(Workflow.forum_metrics), selectinload(Workflow.trends_metrics),
+        ).order_by(Workflow.id)
+        results = (await db.execute(stmt)).scalars().all()
+        body = json.dumps([w.to_dict() for w in results], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return Response(content=body, media_type="application/json")
+
+    return app
+
+async def measure(app: FastAPI, url: str, repeat: int):
+    """Returns (median seconds, body bytes) over `repeat` requests after one warm-up."""
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        body = (await client.get(url)).content
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            resp = await client.get(url)
+            resp.raise_for_status()
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings), body
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        generate_workflows(path, args.rows, args.seed)
+        app = build_app(path)
+
+        runs = [
+            ("to_dict", "/legacy/workflows"),
+            ("api_json", "/api/workflows"),
+            ("fields", "/api/workflows?fields=views,likes,replies"),
+        ]
+        results = {name: asyncio.run(measure(app, url, args.repeat)) for name, url in runs}
+
+    # Same document either way (float formatting aside)
+    assert json.loads(results["to_dict"][1]) == json.loads(results["api_json"][1])
+    baseline = results["to_dict"][0]
+    print(f"{args.rows:,} rows, median of {args.repeat} full-table requests")
+    for name, (seconds, body) in results.items():
+        print(f"{name:>9} | {seconds * 1000:9.1f} ms  {len(body) / 1e6:6.1f} MB  x{baseline / seconds:5.1f}")
+
+if __name__ == "__main__":
+    main()
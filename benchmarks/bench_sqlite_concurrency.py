@@ -0,0 +1,147 @@
+"""
+Harvest writer vs. API readers on one SQLite file, per storage profile.
+
+    python -m benchmarks.bench_sqlite_concurrency --profiles default wal --readers 32 --seconds 20
+
+For every profile a fresh database is seeded, then one thread replays a
+harvest job (a bulk upsert + commit per keyword, like the jobs) while
+--readers threads run /api/workflows page queries through the API's
+connection pool. Reports lock errors ("database is locked") and p50/p99
+latency for both sides.
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+import numpy as np
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.api import workflows
+from app.database.db import create_sqlite_engine
+from app.database.upsert import bulk_upsert_workflows
+from app.database.versioning import get_data_version
+from benchmarks.fixtures import generate_workflows
+
+# (platform, country, limit, order_by) of the page queries issued by readers
+READ_MIX = [
+    (None, None, 50, "id"),
+    ("youtube", None, 50, "views"),
+    ("forum", None, 100, "replies"),
+    ("google", "US", 20, "id"),
+]
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.lock_errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        with self._lock:
+            self.latencies.append(seconds)
+
+    def locked(self):
+        with self._lock:
+            self.lock_errors += 1
+
+    def summary(self) -> str:
+        if not self.latencies:
+            return f"{0:>7} ops  locked {self.lock_errors:>5}"
+        p50, p99 = np.percentile(self.latencies, [50, 99]) * 1000
+        return (f"{len(self.latencies):>7} ops  locked {self.lock_errors:>5}  "
+                f"p50 {p50:7.1f} ms  p99 {p99:8.1f} ms")
+
+def is_lock_error(e: OperationalError) -> bool:
+    return "locked" in str(e) or "busy" in str(e)
+
+def writer(Session, stop: threading.Event, stats: Stats, rows_per_keyword: int, rng):
+    keyword = 0
+    while not stop.is_set():
+        keyword += 1
+        platform = rng.choice(["youtube", "forum", "google"])
+        rows = [{
+            "workflow_name": f"harvested {keyword}-{i}",
+            "platform": platform,
+            "country": "GLOBAL" if platform == "forum" else "US",
+            "keyword": f"kw{keyword}",
+            "views": rng.randint(0, 1_000_000),
+            "likes": rng.randint(0, 50_000),
+            "replies": rng.randint(0, 200),
+            "interest_score": rng.randint(0, 100),
+        } for i in range(rows_per_keyword)]
+        db = Session()
+        start = time.perf_counter()
+        try:
+            bulk_upsert_workflows(db, rows)
+            stats.record(time.perf_counter() - start)
+        except OperationalError as e:
+            db.rollback()
+            if not is_lock_error(e):
+                raise
+            stats.locked()
+        finally:
+            db.close()
+
+def reader(Session, stop: threading.Event, stats: Stats, rng):
+    while not stop.is_set():
+        platform, country, limit, order_by = rng.choice(READ_MIX)
+        db = Session()
+        start = time.perf_counter()
+        try:
+            get_data_version(db)
+            stmt = workflows._page_statement(platform, country, limit, None, order_by, None)
+            results = db.execute(stmt).all()
+            workflows._render_page(results, limit, order_by, None)
+            stats.record(time.perf_counter() - start)
+        except OperationalError as e:
+            if not is_lock_error(e):
+                raise
+            stats.locked()
+        finally:
+            db.close()
+
+def run(profile: str, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "stress.db")
+        generate_workflows(path, args.rows, args.seed)
+        engine = create_sqlite_engine(f"sqlite:///{path}", profile)
+        Session = sessionmaker(bind=engine)
+
+        stop = threading.Event()
+        write_stats, read_stats = Stats(), Stats()
+        threads = [threading.Thread(
+            target=writer, args=(Session, stop, write_stats, args.rows_per_keyword, random.Random(args.seed)),
+        )]
+        threads += [
+            threading.Thread(target=reader, args=(Session, stop, read_stats, random.Random(args.seed + i)))
+            for i in range(args.readers)
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+        engine.dispose()
+
+    print(f"{profile:>8} | writer  {write_stats.summary()}")
+    print(f"{'':>8} | readers {read_stats.summary()}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profiles", nargs="+", default=["default", "wal"])
+    parser.add_argument("--readers", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--rows-per-keyword", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{args.rows:,} rows, 1 writer, {args.readers} readers, {args.seconds:g}s per profile")
+    for profile in args.profiles:
+        run(profile, args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""
+Offline fixtures for the benchmarks: synthetic data plus local stand-ins for
+the three upstream services, so harvest runs are reproducible and never touch
+the network or a quota.
+
+    python -m benchmarks.fixtures --db data_base.db --rows 100000
+
+fills a database (the real one or a scratch file) with N synthetic Workflow
+rows; existing rows are kept.
+
+  FakeYouTube      search().list() / videos().list() of the discovery client
+  DiscourseStub    local HTTP server for /search.json and /t/{id}.json
+  FakeTrendReq     build_payload() / interest_over_time() of pytrends
+
+Every fixture is seeded: the same arguments produce the same responses.
+Pass `latency` (seconds per request) to simulate a remote API.
+"""
+import argparse
+import datetime
+import gzip
+import json
+import os
+import random
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+from app.database.migrations import upgrade_schema
+from app.database.search_index import sync_search_index
+from app.database.upsert import DIMENSION_COLUMNS, NATURAL_KEY
+from app.database.versioning import bump_data_version
+from app.models.platform_metrics import METRIC_MODELS, METRIC_TABLE_COLUMNS
+from app.models.workflow import Workflow, serialize_api_row
+
+# Title words: common integration names plus filler, close to harvested titles
+TITLE_WORDS = (
+    "slack gmail whatsapp telegram notion airtable hubspot stripe shopify openai agent crm "
+    "sheets google drive discord invoice lead email chatbot webhook automation report "
+    "sync backup scraper summary alert onboarding calendar linkedin twitter rss pdf"
+).split()
+
+def _rng(*parts) -> random.Random:
+    """Random generator seeded from the request, independent of call order."""
+    return random.Random(zlib.crc32("|".join(map(str, parts)).encode("utf-8")))
+
+def synthetic_title(rng: random.Random) -> str:
+    return " ".join(rng.sample(TITLE_WORDS, rng.randint(2, 5))).capitalize() + " workflow"
+
+# --- Data generator ---
+
+def synthetic_workflow(i: int, rng: random.Random) -> dict:
+    platform = rng.choice(["youtube", "forum", "google"])
+    record = {
+        "workflow_name": f"{synthetic_title(rng)} #{i}",
+        "platform": platform,
+        "country": "GLOBAL" if platform == "forum" else rng.choice(["US", "IN"]),
+        "keyword": f"kw{i % 80}",
+        "views": rng.randint(0, 1_000_000),
+        "likes": rng.randint(0, 50_000),
+        "comments": rng.randint(0, 5_000),
+        "like_to_view_ratio": rng.random() / 10,
+        "comment_to_view_ratio": rng.random() / 100,
+        "replies": rng.randint(0, 200) if platform == "forum" else None,
+        "contributors": rng.randint(1, 50) if platform == "forum" else None,
+        "interest_score": rng.randint(0, 100) if platform == "google" else None,
+        "growth_pct": rng.uniform(-50, 50) if platform == "google" else None,
+    }
+    record["api_json"] = serialize_api_row(record)
+    return record
+
+def generate_workflows(path: str, rows: int, seed: int = 42, chunk_size: int = 50_000):
+    """
+    Adds `rows` synthetic workflows to the SQLite file at `path` (created and
+    migrated if needed), indexes their titles and bumps the data version.
+    Rows whose natural key already exists are skipped.
+    """
+    engine = create_engine(f"sqlite:///{path}")
+    upgrade_schema(engine)
+    rng = random.Random(seed)
+    dimension = [col for col in DIMENSION_COLUMNS if col != "last_updated"]
+    with engine.begin() as conn:
+        for start in range(0, rows, chunk_size):
+            batch = {
+                tuple(record[col] for col in NATURAL_KEY): record
+                for record in (synthetic_workflow(i, rng) for i in range(start, min(start + chunk_size, rows)))
+            }
+            # Only the rows actually inserted come back, with their ids
+            written = conn.execute(
+                insert(Workflow).prefix_with("OR IGNORE")
+                .returning(Workflow.id, *(getattr(Workflow, col) for col in NATURAL_KEY)),
+                [{col: record[col] for col in dimension} for record in batch.values()],
+            ).all()
+            metrics = {}
+            for workflow_id, *key in written:
+                record = batch[tuple(key)]
+                metrics.setdefault(record["platform"], []).append({
+                    "workflow_id": workflow_id,
+                    **{col: record.get(col) for col in METRIC_TABLE_COLUMNS[record["platform"]]},
+                })
+            for platform, metric_rows in metrics.items():
+                conn.execute(insert(METRIC_MODELS[platform]), metric_rows)
+    sync_search_index(engine)
+    with Session(engine) as db:
+        bump_data_version(db)
+        db.commit()
+    engine.dispose()
+
+# --- YouTube Data API ---
+
+class _Call:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self):
+        return self._fn()
+
+class FakeYouTube:
+    """
+    Stand-in for googleapiclient's youtube v3 resource. Searches return
+    maxResults videos drawn from a pool of `video_pool` IDs, so keywords
+    overlap the way real searches do.
+    """
+
+    def __init__(self, latency: float = 0.0, video_pool: int = 2000, seed: int = 42):
+        self.latency = latency
+        self.video_pool = video_pool
+        self.seed = seed
+        self.calls = {"search": 0, "videos": 0}
+
+    def search(self):
+        return _SearchResource(self)
+
+    def videos(self):
+        return _VideosResource(self)
+
+    def _wait(self, endpoint: str):
+        self.calls[endpoint] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+class _SearchResource:
+    def __init__(self, client: FakeYouTube):
+        self.client = client
+
+    def list(self, q: str, maxResults: int = 5, regionCode: str = "US", **params):
+        def run():
+            self.client._wait("search")
+            ids = _rng(self.client.seed, q, regionCode).sample(range(self.client.video_pool), maxResults)
+            return {"items": [
+                {"id": {"videoId": f"vid{n}"}, "snippet": {"title": synthetic_title(_rng(self.client.seed, n))}}
+                for n in ids
+            ]}
+        return _Call(run)
+
+class _VideosResource:
+    def __init__(self, client: FakeYouTube):
+        self.client = client
+
+    def list(self, id: str, **params):
+        def run():
+            self.client._wait("videos")
+            items = []
+            for video_id in id.split(","):
+                rng = _rng(self.client.seed, video_id)
+                views = rng.randint(100, 2_000_000)
+                items.append({"id": video_id, "statistics": {
+                    "viewCount": str(views),
+                    "likeCount": str(int(views * rng.uniform(0.005, 0.05))),
+                    "commentCount": str(int(views * rng.uniform(0.0005, 0.005))),
+                }})
+            return {"items": items}
+        return _Call(run)
+
+# --- Discourse ---
+
+def self_signed_cert(directory: str):
+    """Writes a throwaway certificate for 127.0.0.1 with openssl; returns (cert, key) paths."""
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-keyout", key, "-out", cert, "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1"],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+class DiscourseStub:
+    """
+    Local Discourse API on a free port. /search.json returns `topics_per_query`
+    topics out of `topic_pool`; /t/{id}.json serves the topic with an ETag
+    and answers 304 to a matching If-None-Match. Bodies are gzipped when the
+    client accepts it.
+
+    With tls=True it serves HTTPS with a self-signed certificate; clients
+    must trust `cert_path` (e.g. via SSL_CERT_FILE / REQUESTS_CA_BUNDLE).
+    hits["connections"] counts accepted connections, i.e. handshakes.
+
+        with DiscourseStub() as stub:
+            AsyncForumService(stub.url, ...)
+    """
+
+    def __init__(self, latency: float = 0.0, topics_per_query: int = 10, topic_pool: int = 500, seed: int = 42, tls: bool = False):
+        self.latency = latency
+        self.topics_per_query = topics_per_query
+        self.topic_pool = topic_pool
+        self.seed = seed
+        self.tls = tls
+        self.cert_path = None
+        self.hits = {"connections": 0, "search": 0, "topic": 0, "not_modified": 0}
+        self._lock = threading.Lock()
+        self._server = None
+        self._tmp = None
+
+    @property
+    def url(self) -> str:
+        return f"{'https' if self.tls else 'http'}://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; without TCP_NODELAY
+            # keep-alive requests stall ~40 ms on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                stub._count("connections")
+                if stub.tls:
+                    # In the connection's own thread, not in the accept loop
+                    self.request.do_handshake()
+                super().setup()
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._handle(self)
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        if self.tls:
+            self._tmp = tempfile.TemporaryDirectory()
+            self.cert_path, key_path = self_signed_cert(self._tmp.name)
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(self.cert_path, key_path)
+            self._server.socket = context.wrap_socket(self._server.socket, server_side=True, do_handshake_on_connect=False)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._tmp:
+            self._tmp.cleanup()
+
+    def _count(self, key: str):
+        with self._lock:
+            self.hits[key] += 1
+
+    def topic(self, topic_id: int) -> dict:
+        rng = _rng(self.seed, "topic", topic_id)
+        posted = datetime.datetime(2025, 1, 1) + datetime.timedelta(minutes=rng.randint(0, 500_000))
+        return {
+            "id": topic_id,
+            "title": synthetic_title(rng),
+            "views": rng.randint(10, 50_000),
+            "like_count": rng.randint(0, 500),
+            "reply_count": rng.randint(0, 120),
+            "participant_count": rng.randint(1, 40),
+            "last_posted_at": posted.isoformat() + "Z",
+        }
+
+    def _handle(self, request: BaseHTTPRequestHandler):
+        if self.latency:
+            time.sleep(self.latency)
+        url = urlparse(request.path)
+        headers = {}
+        if url.path == "/search.json":
+            self._count("search")
+            query = parse_qs(url.query).get("q", [""])[0]
+            ids = _rng(self.seed, "search", query).sample(range(1, self.topic_pool + 1), self.topics_per_query)
+            body = {"topics": [{"id": i, "last_posted_at": self.topic(i)["last_posted_at"]} for i in ids]}
+        elif url.path.startswith("/t/") and url.path.endswith(".json"):
+            self._count("topic")
+            body = self.topic(int(url.path[3:-5]))
+            headers["ETag"] = f'"{zlib.crc32(json.dumps(body).encode("utf-8"))}"'
+            if request.headers.get("If-None-Match") == headers["ETag"]:
+                self._count("not_modified")
+                request.send_response(304)
+                request.send_header("ETag", headers["ETag"])
+                request.send_header("Content-Length", "0")
+                request.end_headers()
+                return
+        else:
+            request.send_response(404)
+            request.send_header("Content-Length", "0")
+            request.end_headers()
+            return
+
+        payload = json.dumps(body).encode("utf-8")
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            payload = gzip.compress(payload)
+            headers["Content-Encoding"] = "gzip"
+        request.send_response(200)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            request.send_header(name, value)
+        request.end_headers()
+        request.wfile.write(payload)
+
+# --- Google Trends ---
+
+class FakeTrendReq:
+    """
+    Stand-in for pytrends' TrendReq: a daily 0-100 series per term over the
+    requested timeframe, with the trailing isPartial row Google sends.
+    """
+
+    def __init__(self, latency: float = 0.0, seed: int = 42):
+        self.latency = latency
+        self.seed = seed
+        self.calls = 0
+        self._payload = None
+
+    def build_payload(self, kw_list, timeframe: str = "today 3-m", geo: str = "", **params):
+        self._payload = (list(kw_list), timeframe, geo)
+
+    def interest_over_time(self) -> pd.DataFrame:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        kw_list, timeframe, geo = self._payload
+        today = datetime.date.today()
+        if timeframe == "today 3-m":
+            start = today - datetime.timedelta(days=90)
+        else:
+            start = datetime.date.fromisoformat(timeframe.split()[0])
+        index = pd.date_range(start, today, freq="D", name="date")
+
+        columns = {}
+        for term in kw_list:
+            rng = np.random.default_rng(zlib.crc32(f"{self.seed}|{term}|{geo}".encode("utf-8")))
+            level = rng.uniform(10, 60)
+            # Random walk around a per-term level, anchored to absolute dates
+            offset = max((start - datetime.date(2024, 1, 1)).days, 0)
+            walk = np.cumsum(rng.normal(0, 2, offset + len(index)))[offset:]
+            columns[term] = np.clip(level + walk, 0, 100).round().astype(int)
+        df = pd.DataFrame(columns, index=index)
+        df["isPartial"] = False
+        df.iloc[-1, df.columns.get_loc("isPartial")] = True
+        return df
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", required=True, help="SQLite file to fill (e.g. data_base.db)")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    generate_workflows(args.db, args.rows, args.seed)
+    print(f"✅ {args.rows:,} synthetic workflows written to {args.db} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Reproducible end-to-end benchmark suite, fully offline.
+
+    python -m benchmarks.run_suite --rows 1000 10000 100000
+    python -m benchmarks.run_suite --baseline benchmarks/results/suite-20250101-120000.json
+
+Runs against the fixtures in benchmarks.fixtures (no network, no quota):
+  harvest  records/sec of each harvester (fetch + upsert, the job loop
+           without request pacing) against the local stand-ins
+  upsert   cost of one bulk_upsert_workflows batch (half new rows, half
+           updates) on a table of N rows
+  api      p50/p99 latency of /api/workflows page requests (in-process
+           ASGI, response cache disabled) on a table of N rows
+
+Results are written as JSON (environment, parameters, numbers). With
+--baseline every metric is printed next to the previous run's value.
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+import httpx
+import numpy as np
+from fastapi import FastAPI
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+from app.api import workflows
+from app.api.cache import ResponseCache
+from app.database.db import create_async_sqlite_engine, create_sqlite_engine, get_async_db
+from app.database.migrations import upgrade_schema
+from app.database.upsert import NATURAL_KEY, bulk_upsert_workflows
+from app.models.workflow import Workflow
+from app.services.async_forum_service import AsyncForumService
+from app.services.trends_service import TrendsService
+from app.services.youtube_service import YouTubeService
+from app.utils.config import Config
+from app.utils.http_cache import HttpCache
+from app.utils.rate_limiter import AdaptiveRateLimiter
+from app.utils.resilience import SourceResilience
+from benchmarks.bench_api_load import REQUEST_MIX
+from benchmarks.fixtures import (
+    DiscourseStub, FakeTrendReq, FakeYouTube, generate_workflows, synthetic_workflow,
+)
+from jobs.update_forum import harvest_forum
+from jobs.update_trends import harvest_trends_batch
+from jobs.update_youtube import KEYWORD_BATCH_SIZE, harvest_youtube_batch
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+def session_factory(path: str):
+    engine = create_sqlite_engine(f"sqlite:///{path}")
+    upgrade_schema(engine)
+    return engine, sessionmaker(bind=engine)
+
+# --- Harvest throughput ---
+
+def unpaced(source: str) -> SourceResilience:
+    """Retry policy without pacing: measures the pipeline, not the politeness budget."""
+    return SourceResilience(source, AdaptiveRateLimiter(rate=1_000_000))
+
+def harvest_youtube(Session, keywords, latency: float):
+    service = YouTubeService(youtube=FakeYouTube(latency=latency), resilience=unpaced("youtube"))
+    written = 0
+    with Session() as db:
+        for start in range(0, len(keywords), KEYWORD_BATCH_SIZE):
+            rows = harvest_youtube_batch(service, keywords[start:start + KEYWORD_BATCH_SIZE])
+            written += sum(bulk_upsert_workflows(db, rows).values())
+    return written, service.youtube.calls["search"] + service.youtube.calls["videos"]
+
+def harvest_forum_stub(Session, keywords, latency: float, tmp: str):
+    with DiscourseStub(latency=latency) as stub, Session() as db:
+        service = AsyncForumService(
+            stub.url,
+            http_cache=HttpCache(os.path.join(tmp, "http_cache.db"), max_bytes=Config.FORUM_HTTP_CACHE_MB * 1024 * 1024),
+            resilience=unpaced("forum"),
+        )
+        written = sum(bulk_upsert_workflows(db, harvest_forum(service, keywords)).values())
+        service.http_cache.close()
+        return written, stub.hits["search"] + stub.hits["topic"]
+
+def harvest_trends(Session, keywords, latency: float):
+    service = TrendsService(pytrends=FakeTrendReq(latency=latency), resilience=unpaced("google"))
+    written = 0
+    with Session() as db:
+        for country in Config.REGIONS:
+            for start in range(0, len(keywords), Config.TRENDS_BATCH_SIZE):
+                rows = harvest_trends_batch(db, service, keywords[start:start + Config.TRENDS_BATCH_SIZE], country)
+                written += sum(bulk_upsert_workflows(db, rows).values())
+    return written, service.pytrends.calls
+
+def bench_harvest(keywords: int, latency: float) -> dict:
+    words = [f"synthetic keyword {i}" for i in range(keywords)]
+    results = {}
+    runs = {
+        "youtube": lambda Session, tmp: harvest_youtube(Session, words, latency),
+        "forum": lambda Session, tmp: harvest_forum_stub(Session, words, latency, tmp),
+        "google": lambda Session, tmp: harvest_trends(Session, words, latency),
+    }
+    for source, run in runs.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            engine, Session = session_factory(os.path.join(tmp, "harvest.db"))
+            start = time.perf_counter()
+            records, requests = run(Session, tmp)
+            seconds = time.perf_counter() - start
+            engine.dispose()
+        results[source] = {
+            "records": records,
+            "requests": requests,
+            "seconds": round(seconds, 3),
+            "records_per_sec": round(records / seconds, 1),
+        }
+        print(f"  harvest {source:>8} | {records:6,} records  {requests:5,} requests  {records / seconds:9,.0f} rec/s")
+    return results
+
+# --- Upsert cost ---
+
+def bench_upsert(path: str, rows: int, batch_size: int, repeat: int, seed: int) -> dict:
+    engine, Session = session_factory(path)
+    rng = random.Random(seed)
+    timings = []
+    with Session() as db:
+        for r in range(repeat):
+            # Half fresh rows, half new metrics for rows already in the table
+            fresh = [synthetic_workflow(rows + r * batch_size + i, rng) for i in range(batch_size // 2)]
+            keys = db.execute(
+                select(*(getattr(Workflow, col) for col in NATURAL_KEY))
+                .order_by(func.random()).limit(batch_size - len(fresh))
+            ).all()
+            again = [{**synthetic_workflow(i, rng), **dict(zip(NATURAL_KEY, key))} for i, key in enumerate(keys)]
+            start = time.perf_counter()
+            bulk_upsert_workflows(db, fresh + again)
+            timings.append(time.perf_counter() - start)
+    engine.dispose()
+    median = float(np.median(timings))
+    return {
+        "batch_size": batch_size,
+        "median_ms": round(median * 1000, 2),
+        "rows_per_sec": round(batch_size / median, 1),
+    }
+
+# --- API latency ---
+
+def build_app(path: str) -> FastAPI:
+    AsyncSession = async_sessionmaker(create_async_sqlite_engine(f"sqlite+aiosqlite:///{path}"), expire_on_commit=False)
+    workflows.response_cache = ResponseCache(maxsize=0)
+
+    app = FastAPI()
+
+    async def bench_async_db():
+        async with AsyncSession() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = bench_async_db
+    app.include_router(workflows.router, prefix="/api")
+    return app
+
+async def api_latencies(app: FastAPI, repeat: int):
+    latencies = []
+    async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+        for url in REQUEST_MIX:
+            (await client.get(f"/api{url}")).raise_for_status()  # warm-up
+        for _ in range(repeat):
+            for url in REQUEST_MIX:
+                start = time.perf_counter()
+                (await client.get(f"/api{url}")).raise_for_status()
+                latencies.append(time.perf_counter() - start)
+    return np.array(latencies)
+
+def bench_api(path: str, repeat: int) -> dict:
+    latencies = asyncio.run(api_latencies(build_app(path), repeat)) * 1000
+    return {
+        "requests": len(latencies),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 2),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 2),
+    }
+
+# --- Results ---
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).resolve().parent.parent,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+    }
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    """{"api": {"1000": {"p50_ms": 1.2}}} -> {"api.1000.p50_ms": 1.2}"""
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+def compare(current: dict, baseline: dict):
+    old = flatten(baseline["results"])
+    print(f"\n📊 Compared with {baseline['environment']['timestamp']} ({baseline['environment']['commit']})")
+    for name, value in flatten(current["results"]).items():
+        if name in old and old[name]:
+            print(f"  {name:<40} {old[name]:>12,.2f} -> {value:>12,.2f}  {(value - old[name]) / old[name]:+7.1%}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000],
+                        help="table sizes for the upsert and api benchmarks")
+    parser.add_argument("--keywords", type=int, default=40, help="keywords per harvester")
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated upstream latency per request (seconds)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, default=None, help="results file (default: benchmarks/results/suite-<time>.json)")
+    parser.add_argument("--baseline", type=Path, default=None, help="earlier results file to compare against")
+    args = parser.parse_args()
+
+    # The harvest helpers log every keyword; keep the report readable
+    logging.disable(logging.INFO)
+
+    report = {
+        "environment": environment(),
+        "parameters": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+        "results": {},
+    }
+
+    print(f"🚀 Harvest throughput ({args.keywords} keywords, {args.latency * 1000:.0f} ms upstream latency)")
+    report["results"]["harvest"] = bench_harvest(args.keywords, args.latency)
+    report["results"]["upsert"] = {}
+    report["results"]["api"] = {}
+
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.db")
+            generate_workflows(path, rows, args.seed)
+            api = report["results"]["api"][str(rows)] = bench_api(path, args.repeat)
+            upsert = report["results"]["upsert"][str(rows)] = bench_upsert(
+                path, rows, args.batch_size, args.repeat, args.seed,
+            )
+        print(
+            f"  {rows:>9,} rows | api p50 {api['p50_ms']:8.2f} ms  p99 {api['p99_ms']:8.2f} ms"
+            f" | upsert {upsert['median_ms']:8.2f} ms/batch  {upsert['rows_per_sec']:9,.0f} rows/s"
+        )
+
+    output = args.output or RESULTS_DIR / f"suite-{datetime.datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"✅ Results written to {output}")
+
+    if args.baseline:
+        compare(report, json.loads(args.baseline.read_text(encoding="utf-8")))
+
+if __name__ == "__main__":
+    main()
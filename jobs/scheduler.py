@@ -0,0 +1,181 @@
+import datetime
+import logging
+import math
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.schedulers.blocking import BlockingScheduler
+from app.database.db import SessionLocal, engine
+from app.database.migrations import upgrade_schema
+from app.database.upsert import bulk_upsert_workflows
+from app.services.async_forum_service import AsyncForumService
+from app.services.dedup_service import assign_clusters
+from app.services.forum_service import MAX_TOPICS_PER_QUERY
+from app.services.history_service import compact_snapshots
+from app.services.priority import prioritize_keywords
+from app.services.ranking_service import refresh_rankings
+from app.services.trends_service import TrendsService
+from app.services.youtube_service import YouTubeService
+from app.utils.config import Config
+from app.utils.metrics import QUOTA_UNITS_SPENT
+from app.utils.quota import QuotaBudget
+from jobs.update_forum import harvest_forum
+from jobs.update_trends import fetch_trends_batch, store_trends_batch
+from jobs.update_youtube import harvest_youtube_batch
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("harvest-scheduler")
+
+class SourceWorker:
+    """
+    Harvests one source in its own scheduler thread.
+
+    Every cycle takes the highest-priority keywords the remaining daily
+    quota can pay for, then harvests, upserts and refreshes the rankings.
+    Requests are paced by the source's own adaptive rate limiter inside the
+    service clients, so sources never wait on each other.
+    """
+
+    def __init__(self, platform: str, harvest, cost, settings: dict):
+        """
+        harvest(db, keywords) -> unified rows
+        cost(n_keywords) -> quota units of harvesting n keywords
+        """
+        self.platform = platform
+        self.harvest = harvest
+        self.cost = cost
+        self.keywords_per_cycle = settings["keywords_per_cycle"]
+        self.interval_seconds = settings["interval_seconds"]
+        self.budget = QuotaBudget(platform, settings["daily_quota"], SessionLocal)
+        # In-memory record of attempts, so failing keywords or ones without results don't hog the queue
+        self.last_attempts = {}
+
+    def _affordable(self, keywords):
+        """Largest prefix of `keywords` the remaining quota can pay for."""
+        remaining = self.budget.remaining
+        count = min(self.keywords_per_cycle, len(keywords))
+        while count and self.cost(count) > remaining:
+            count -= 1
+        return keywords[:count]
+
+    def run_cycle(self):
+        db = SessionLocal()
+        spent_before = None
+        try:
+            ordered = prioritize_keywords(db, self.platform, Config.get_keywords(), self.last_attempts)
+            chunk = self._affordable(ordered)
+            reserved = self.cost(len(chunk))
+            if not chunk or not self.budget.try_spend(reserved):
+                logger.info(f"⏸️ [{self.platform}] Daily quota exhausted ({self.budget.remaining} units left)")
+                return
+
+            logger.info(f"🚜 [{self.platform}] Harvesting {len(chunk)} keywords: {', '.join(chunk)}")
+            spent_before = QUOTA_UNITS_SPENT.value(source=self.platform)
+            try:
+                rows = self.harvest(db, chunk)
+            finally:
+                # Failed batches count as attempted too, or they would stay first in line
+                # and burn the daily quota on every cycle
+                now = datetime.datetime.utcnow()
+                for keyword in chunk:
+                    self.last_attempts[keyword] = now
+
+            counts = bulk_upsert_workflows(db, rows)
+            assign_clusters(db)
+            refresh_rankings(db)
+            logger.info(f"✅ [{self.platform}] New: {counts['inserted']}, Updated: {counts['updated']}")
+        except Exception as e:
+            logger.error(f"❌ [{self.platform}] Harvest cycle failed: {e}")
+            db.rollback()
+        finally:
+            db.close()
+            if spent_before is not None:
+                # Charge what the clients actually used (retries, shared statistics
+                # lookups...) instead of the estimate; one cycle per source runs at a time
+                self.budget.reconcile(reserved, int(QUOTA_UNITS_SPENT.value(source=self.platform) - spent_before))
+                logger.info(f"🎫 [{self.platform}] Quota left: {self.budget.remaining}")
+
+def _youtube_worker():
+    service = YouTubeService()
+    regions = len(Config.REGIONS)
+
+    def cost(n):
+        searches = n * regions
+        stats_calls = math.ceil(searches * 5 / 50)
+        return searches * Config.YOUTUBE_SEARCH_COST + stats_calls * Config.YOUTUBE_VIDEOS_LIST_COST
+
+    return SourceWorker(
+        "youtube", lambda db, keywords: harvest_youtube_batch(service, keywords),
+        cost, Config.SCHEDULER_SOURCES["youtube"],
+    )
+
+def _forum_worker():
+    service = AsyncForumService()
+
+    def cost(n):
+        # One search plus at most MAX_TOPICS_PER_QUERY topic details per keyword
+        return n * (1 + MAX_TOPICS_PER_QUERY)
+
+    return SourceWorker(
+        "forum", lambda db, keywords: harvest_forum(service, keywords),
+        cost, Config.SCHEDULER_SOURCES["forum"],
+    )
+
+def _trends_worker():
+    service = TrendsService()
+
+    def harvest(db, keywords):
+        # Download every region first: the points are written uncommitted, and
+        # no request should run while this worker holds the write lock
+        fetched = [(country, fetch_trends_batch(db, service, keywords, country)) for country in Config.REGIONS]
+        rows = []
+        for country, batch_series in fetched:
+            rows.extend(store_trends_batch(db, service, keywords, country, batch_series))
+        return rows
+
+    def cost(n):
+        # One batched request per region (4 keywords + anchor)
+        return math.ceil(n / Config.TRENDS_BATCH_SIZE) * len(Config.REGIONS)
+
+    settings = dict(Config.SCHEDULER_SOURCES["google"])
+    settings["keywords_per_cycle"] = min(settings["keywords_per_cycle"], Config.TRENDS_BATCH_SIZE)
+    return SourceWorker("google", harvest, cost, settings)
+
+def _compact_history():
+    """Daily roll-up of old metric snapshots to weekly aggregates."""
+    db = SessionLocal()
+    try:
+        logger.info(f"🗜️ History compacted ({compact_snapshots(db)} snapshots rolled up)")
+    except Exception as e:
+        logger.error(f"❌ Failed to compact history: {e}")
+    finally:
+        db.close()
+
+def run_scheduler():
+    upgrade_schema(engine)
+    workers = [_youtube_worker(), _forum_worker(), _trends_worker()]
+
+    # One thread per source (each harvests at its own pace) plus one for compaction
+    scheduler = BlockingScheduler(
+        executors={"default": ThreadPoolExecutor(len(workers) + 1)},
+        timezone="UTC",
+    )
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for worker in workers:
+        scheduler.add_job(
+            worker.run_cycle, "interval",
+            seconds=worker.interval_seconds,
+            id=worker.platform,
+            max_instances=1,
+            coalesce=True,
+            next_run_time=now,
+        )
+    scheduler.add_job(_compact_history, "interval", days=1, id="compaction", max_instances=1, coalesce=True)
+
+    logger.info("🚀 Harvest scheduler started (YouTube, Forum, Google Trends)")
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        logger.info("🛑 Harvest scheduler stopped.")
+
+if __name__ == "__main__":
+    run_scheduler()
@@ -1,68 +1,106 @@
-from app.database.db import SessionLocal
-from app.services.forum_service import ForumService
-from app.models.workflow import Workflow
+from app.database.db import SessionLocal, engine
+from app.database.migrations import upgrade_schema
+from app.database.upsert import bulk_upsert_workflows
+from app.services.checkpoints import (
+    add_checkpoint_arguments, finish_run, mark_units, pending_units, start_run,
+)
+from app.services.dedup_service import assign_clusters
+from app.services.history_service import compact_snapshots
+from app.services.ranking_service import refresh_rankings
+from app.services.async_forum_service import AsyncForumService
 from app.utils.config import Config
-import time
+from app.utils.metrics import write_run_summary
+import argparse
 import logging
 
 # Set up logging to track long-running harvest progress
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("forum-harvester")
 
-def run_forum_job():
+# Keywords harvested (and checkpointed) per transaction
+CHECKPOINT_EVERY = 20
+
+def harvest_forum(service, keywords, topics: dict = None):
+    """
+    Harvests the given keywords concurrently and returns the unified rows.
+    Raises when the forum cannot be searched, so the keywords are not marked done.
+    """
+    harvested = service.fetch_all(keywords, topics)
+
+    rows = []
+    for i, keyword in enumerate(keywords):
+        # Deep topic metrics gathered by the async harvester
+        results = harvested.get(keyword, [])
+        logger.info(f"[{i+1}/{len(keywords)}] {len(results)} topics for: {keyword}")
+
+        if not results:
+            logger.warning(f"⚠️ No results found for '{keyword}'")
+        rows.extend(results)
+    return rows
+
+def run_forum_job(resume: bool = False, freshness_hours: float = None):
+    upgrade_schema(engine)
     db = SessionLocal()
-    service = ForumService()
+    service = AsyncForumService()
     
     logger.info("🚀 Starting Deep Forum Data Harvest...")
     
     # Load keywords from data/seed_workflows.json
     keywords = Config.get_keywords()
-    total_keywords = len(keywords)
-    
+    run = start_run(db, "forum", [(k, "GLOBAL") for k in keywords], resume=resume)
+    pending = [k for k, _ in pending_units(db, run, freshness_hours)]
+    logger.info(f"📋 Run #{run.id}: {len(pending)} keywords to harvest")
+
     new_records = 0
     updated_records = 0
 
-    for i, keyword in enumerate(keywords):
-        logger.info(f"[{i+1}/{total_keywords}] Harvesting for: {keyword}")
-        
+    # Checkpoint every chunk; topic details fetched during this run are shared across chunks
+    topics = {}
+    for start in range(0, len(pending), CHECKPOINT_EVERY):
+        chunk = pending[start:start + CHECKPOINT_EVERY]
+        units = [(k, "GLOBAL") for k in chunk]
         try:
-            # fetch_workflow_data now returns the deep topic metrics
-            results = service.fetch_workflow_data(keyword)
-            
-            if not results:
-                logger.warning(f"⚠️ No results found for '{keyword}'")
-                continue
-
-            for data in results:
-                # Deduplication: Check if this specific thread title exists for 'forum'
-                existing = db.query(Workflow).filter(
-                    Workflow.workflow_name == data["workflow_name"],
-                    Workflow.platform == "forum"
-                ).first()
-                
-                if existing:
-                    # Update metrics for the Unified Shape
-                    existing.replies = data.get("replies")
-                    existing.likes = data.get("likes")
-                    existing.views = data.get("views")
-                    existing.contributors = data.get("contributors")
-                    updated_records += 1
-                else:
-                    # Insert new record into the Unified Shape
-                    db.add(Workflow(**data))
-                    new_records += 1
-            
-            # Commit after every keyword to prevent massive transaction lockup
-            db.commit()
-            
+            # Harvest the chunk concurrently; topic details shared between keywords are fetched once
+            rows = harvest_forum(service, chunk, topics)
+            # One transaction per chunk
+            counts = bulk_upsert_workflows(db, rows)
+            new_records += counts["inserted"]
+            updated_records += counts["updated"]
+            mark_units(db, run, units, "done")
         except Exception as e:
-            logger.error(f"❌ Critical error during keyword '{keyword}': {e}")
-            db.rollback() # Undo any pending changes if commit failed
-            # Optional: Sleep longer if error suggests a rate limit
-            time.sleep(5)
+            logger.error(f"❌ Failed to harvest or save forum results: {e}")
+            mark_units(db, run, units, "failed")
+
+    logger.info(f"📋 Run #{run.id} {finish_run(db, run)}")
             
+    try:
+        # Keep the materialized cross-platform ranking in step with the new data
+        ranked = refresh_rankings(db)
+        logger.info(f"🏆 Rankings refreshed ({ranked} entries)")
+    except Exception as e:
+        logger.error(f"❌ Failed to refresh rankings: {e}")
+
+    try:
+        # Group the new titles with their near-duplicates
+        clustered = assign_clusters(db)
+        logger.info(f"🧩 Titles clustered ({clustered} new rows)")
+    except Exception as e:
+        logger.error(f"❌ Failed to cluster titles: {e}")
+
+    try:
+        # Roll snapshots past the retention window up to weekly aggregates
+        compacted = compact_snapshots(db)
+        logger.info(f"🗜️ History compacted ({compacted} snapshots rolled up)")
+    except Exception as e:
+        logger.error(f"❌ Failed to compact history: {e}")
+
+    summary = write_run_summary(Config.RUN_SUMMARY_DIR / f"forum-run{run.id}.json")
+    logger.info("📊 Run summary:\n  " + "\n  ".join(summary))
+
     db.close()
     logger.info(f"✅ Forum Job Finished. New: {new_records}, Updated: {updated_records}")
 
 if __name__ == "__main__":
-    run_forum_job()
\ No newline at end of file
+    parser = add_checkpoint_arguments(argparse.ArgumentParser(description="Harvest forum metrics for the seed keywords."))
+    args = parser.parse_args()
+    run_forum_job(resume=args.resume, freshness_hours=args.freshness_hours)
@@ -1,71 +1,122 @@
-import time
-import random
+import argparse
 import logging
-from app.database.db import SessionLocal
+from app.database.db import SessionLocal, engine
+from app.database.migrations import upgrade_schema
+from app.database.upsert import bulk_upsert_workflows
+from app.services.checkpoints import (
+    add_checkpoint_arguments, finish_run, mark_units, pending_units, start_run,
+)
+from app.services.dedup_service import assign_clusters
+from app.services.history_service import compact_snapshots
+from app.services.ranking_service import refresh_rankings
+from app.services.trend_store import growth_metrics, incremental_start, store_series
 from app.services.trends_service import TrendsService
-from app.models.workflow import Workflow
 from app.utils.config import Config
+from app.utils.metrics import write_run_summary
 
 # Configure logging for long-running harvest
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("trends-harvester")
 
-# Strict timing to avoid 429 Too Many Requests
-MIN_SLEEP = 15
-MAX_SLEEP = 25
+def fetch_trends_batch(db, service, batch, country):
+    """Runs one batched Trends request (up to 4 keywords + anchor) for a region; writes nothing."""
+    # Only download the days since the oldest last-stored point of the batch (plus an overlap)
+    starts = [incremental_start(db, keyword, country) for keyword in batch]
+    start = None if None in starts else min(starts)
+    return service.fetch_series_batch(batch, country, start=start)
 
-def run_trends_job():
+def store_trends_batch(db, service, batch, country, batch_series):
+    """
+    Adds the downloaded daily points to the session's transaction and
+    returns the unified rows. The caller commits both together
+    (bulk_upsert_workflows), or rolls both back.
+    """
+    rows = []
+    for keyword in batch:
+        series = batch_series.get(keyword)
+        if series is None:
+            logger.warning(f"⚠️ No data found or skipped for: {keyword}")
+            continue
+        store_series(db, keyword, country, series)
+        # interest_score and growth_pct come from the stored history
+        metrics = growth_metrics(db, keyword, country)
+        rows.append(service.to_unified(keyword, country, **metrics))
+    return rows
+
+def harvest_trends_batch(db, service, batch, country):
+    """Fetches then stores one batch; see store_trends_batch for the transaction."""
+    return store_trends_batch(db, service, batch, country, fetch_trends_batch(db, service, batch, country))
+
+def run_trends_job(resume: bool = False, freshness_hours: float = None):
+    upgrade_schema(engine)
     db = SessionLocal()
     service = TrendsService()
     
     logger.info("🚀 Starting Google Trends Data Harvest (Unified Big Shape)...")
     
     keywords = Config.get_keywords()
-    total_tasks = len(keywords) * len(Config.REGIONS)
-    current_task = 0
+    run = start_run(db, "google", [(k, c) for k in keywords for c in Config.REGIONS], resume=resume)
+    pending = pending_units(db, run, freshness_hours)
+    logger.info(f"📋 Run #{run.id}: {len(pending)} keyword/region units to harvest")
 
-    for keyword in keywords:
-        for country in Config.REGIONS:
-            current_task += 1
-            logger.info(f"[{current_task}/{total_tasks}] Processing: {keyword} | Region: {country}")
-            
-            try:
-                # fetch_workflow_data now returns interest_score, growth_pct, and monthly_volume
-                data = service.fetch_workflow_data(keyword, country)
-                
-                if data:
-                    existing = db.query(Workflow).filter(
-                        Workflow.workflow_name == data["workflow_name"],
-                        Workflow.platform == "google",
-                        Workflow.country == country
-                    ).first()
-                    
-                    if existing:
-                        # Update the specific Unified Trends fields
-                        existing.interest_score = data.get("interest_score")
-                        existing.growth_pct = data.get("growth_pct")
-                        existing.monthly_volume = data.get("monthly_volume")
-                    else:
-                        # Insert new entry into the Big Unified Shape
-                        db.add(Workflow(**data))
-                    
-                    db.commit()
-                    logger.info(f"✅ Saved Trend: {keyword} ({country})")
-                else:
-                    logger.warning(f"⚠️ No data found or skipped for: {keyword}")
+    # Batched mode: every request carries 4 keywords plus the shared anchor term
+    tasks = []
+    for country in Config.REGIONS:
+        region_keywords = [k for k, c in pending if c == country]
+        tasks += [
+            (region_keywords[i:i + Config.TRENDS_BATCH_SIZE], country)
+            for i in range(0, len(region_keywords), Config.TRENDS_BATCH_SIZE)
+        ]
+
+    for current_task, (batch, country) in enumerate(tasks, start=1):
+        units = [(k, country) for k in batch]
+        logger.info(f"[{current_task}/{len(tasks)}] Processing: {', '.join(batch)} | Region: {country}")
+        
+        try:
+            rows = harvest_trends_batch(db, service, batch, country)
+            # Save the points and rows of the batch in one transaction, then checkpoint it
+            bulk_upsert_workflows(db, rows)
+            mark_units(db, run, units, "done")
+            if rows:
+                logger.info(f"✅ Saved Trends: {', '.join(r['keyword'] for r in rows)} ({country})")
 
-            except Exception as e:
-                logger.error(f"❌ Error during Trends harvest for '{keyword}': {e}")
-                db.rollback()
-                # If we hit an error, sleep longer to cool down the connection
-                time.sleep(60)
+        except Exception as e:
+            logger.error(f"❌ Error during Trends harvest for '{', '.join(batch)}': {e}")
+            db.rollback()
+            mark_units(db, run, units, "failed")
+        # No fixed cooldown: TrendsService paces its requests (Config.SOURCE_PACING)
+        # and backs off on its own when Google answers 429
 
-            # Mandatory cooldown to avoid Google IP ban
-            sleep_time = random.uniform(MIN_SLEEP, MAX_SLEEP)
-            time.sleep(sleep_time)
+    logger.info(f"📋 Run #{run.id} {finish_run(db, run)}")
             
+    try:
+        # Keep the materialized cross-platform ranking in step with the new data
+        ranked = refresh_rankings(db)
+        logger.info(f"🏆 Rankings refreshed ({ranked} entries)")
+    except Exception as e:
+        logger.error(f"❌ Failed to refresh rankings: {e}")
+
+    try:
+        # Group the new titles with their near-duplicates
+        clustered = assign_clusters(db)
+        logger.info(f"🧩 Titles clustered ({clustered} new rows)")
+    except Exception as e:
+        logger.error(f"❌ Failed to cluster titles: {e}")
+
+    try:
+        # Roll snapshots past the retention window up to weekly aggregates
+        compacted = compact_snapshots(db)
+        logger.info(f"🗜️ History compacted ({compacted} snapshots rolled up)")
+    except Exception as e:
+        logger.error(f"❌ Failed to compact history: {e}")
+
+    summary = write_run_summary(Config.RUN_SUMMARY_DIR / f"google-run{run.id}.json")
+    logger.info("📊 Run summary:\n  " + "\n  ".join(summary))
+
     db.close()
     logger.info("🏁 Google Trends Job Finished.")
 
 if __name__ == "__main__":
-    run_trends_job()
\ No newline at end of file
+    parser = add_checkpoint_arguments(argparse.ArgumentParser(description="Harvest Google Trends metrics for the seed keywords."))
+    args = parser.parse_args()
+    run_trends_job(resume=args.resume, freshness_hours=args.freshness_hours)
\ No newline at end of file
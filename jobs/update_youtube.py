@@ -1,67 +1,104 @@
-import time
+import argparse
 import logging
-from app.database.db import SessionLocal
+from app.database.db import SessionLocal, engine
+from app.database.migrations import upgrade_schema
+from app.database.upsert import bulk_upsert_workflows
+from app.services.checkpoints import (
+    add_checkpoint_arguments, finish_run, mark_units, pending_units, start_run,
+)
+from app.services.dedup_service import assign_clusters
+from app.services.history_service import compact_snapshots
+from app.services.ranking_service import refresh_rankings
 from app.services.youtube_service import YouTubeService
-from app.models.workflow import Workflow
 from app.utils.config import Config
+from app.utils.metrics import write_run_summary
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("youtube-harvester")
 
-def run_youtube_job():
+# 20 keywords x 5 hits = 100 video IDs per region, deduplicated across
+# keywords and regions before the statistics calls
+KEYWORD_BATCH_SIZE = 20
+
+def harvest_youtube_batch(service, keywords, regions=None, units=None):
+    """
+    Harvests a group of keywords in every region (or only the given
+    (keyword, region) units) and returns the unified rows.
+    """
+    # fetch_batch returns the complete dictionaries for the Unified DB per keyword/region
+    batch_results = service.fetch_batch(keywords, regions or Config.REGIONS, units)
+    return [data for results in batch_results.values() for data in results]
+
+def run_youtube_job(resume: bool = False, freshness_hours: float = None):
+    upgrade_schema(engine)
     db = SessionLocal()
     service = YouTubeService()
     
     logger.info("🚀 Starting YouTube Data Harvest (Big Unified Shape)...")
     
     keywords = Config.get_keywords()
-    total_keywords = len(keywords)
+    run = start_run(db, "youtube", [(k, r) for k in keywords for r in Config.REGIONS], resume=resume)
+    pending = pending_units(db, run, freshness_hours)
+    logger.info(f"📋 Run #{run.id}: {len(pending)} keyword/region units to harvest")
+
+    new_records = 0
+    updated_records = 0
     
-    for i, keyword in enumerate(keywords):
-        for region in Config.REGIONS:
-            logger.info(f"[{i+1}/{total_keywords}] Fetching: {keyword} in {region}")
-            
-            try:
-                # fetch_workflow_data returns the complete dictionary for the Unified DB
-                results = service.fetch_workflow_data(keyword, region)
-                
-                for data in results:
-                    # Upsert Logic: Check if workflow exists for this platform/country
-                    # We use the title and platform to find existing records
-                    existing = db.query(Workflow).filter(
-                        Workflow.workflow_name == data["workflow_name"],
-                        Workflow.platform == "youtube",
-                        Workflow.country == region
-                    ).first()
-                    
-                    if existing:
-                        # Update all YouTube-related metrics in the Big Shape
-                        existing.views = data["views"]
-                        existing.likes = data["likes"]
-                        existing.comments = data["comments"]
-                        existing.like_to_view_ratio = data["like_to_view_ratio"]
-                        existing.comment_to_view_ratio = data["comment_to_view_ratio"]
-                        logger.debug(f"Updated: {data['workflow_name']}")
-                    else:
-                        # Add new entry with the full set of keys (including NULLs for other platforms)
-                        new_wf = Workflow(**data)
-                        db.add(new_wf)
-                        logger.debug(f"Added New: {data['workflow_name']}")
-                
-                # Commit after every keyword/region pair to ensure progress is saved
-                db.commit()
-                
-                # Small sleep to manage YouTube API quota usage
-                time.sleep(0.5) 
-                
-            except Exception as e:
-                logger.error(f"❌ Error harvesting YouTube data for '{keyword}': {e}")
-                db.rollback()
-                time.sleep(2) # Wait a bit before retrying next keyword
+    # Pending regions per keyword, in seed order
+    pending_regions = {}
+    for keyword, region in pending:
+        pending_regions.setdefault(keyword, []).append(region)
+    pending_keywords = list(pending_regions)
+
+    # Keywords are harvested in groups, all their pending regions in one call,
+    # so statistics lookups are shared across keywords and regions
+    for start in range(0, len(pending_keywords), KEYWORD_BATCH_SIZE):
+        batch = pending_keywords[start:start + KEYWORD_BATCH_SIZE]
+        units = [(k, r) for k in batch for r in pending_regions[k]]
+        logger.info(f"[{start + len(batch)}/{len(pending_keywords)}] Fetching batch of {len(batch)} keywords ({len(units)} keyword/region units)")
+
+        try:
+            rows = harvest_youtube_batch(service, batch, units=units)
+            # Commit after every keyword batch to ensure progress is saved
+            counts = bulk_upsert_workflows(db, rows)
+            new_records += counts["inserted"]
+            updated_records += counts["updated"]
+            mark_units(db, run, units, "done")
+        except Exception as e:
+            logger.error(f"❌ Error saving YouTube data for batch starting at '{batch[0]}': {e}")
+            mark_units(db, run, units, "failed")
+
+    logger.info(f"📋 Run #{run.id} {finish_run(db, run)}")
                 
+    try:
+        # Keep the materialized cross-platform ranking in step with the new data
+        ranked = refresh_rankings(db)
+        logger.info(f"🏆 Rankings refreshed ({ranked} entries)")
+    except Exception as e:
+        logger.error(f"❌ Failed to refresh rankings: {e}")
+
+    try:
+        # Group the new titles with their near-duplicates
+        clustered = assign_clusters(db)
+        logger.info(f"🧩 Titles clustered ({clustered} new rows)")
+    except Exception as e:
+        logger.error(f"❌ Failed to cluster titles: {e}")
+
+    try:
+        # Roll snapshots past the retention window up to weekly aggregates
+        compacted = compact_snapshots(db)
+        logger.info(f"🗜️ History compacted ({compacted} snapshots rolled up)")
+    except Exception as e:
+        logger.error(f"❌ Failed to compact history: {e}")
+
+    summary = write_run_summary(Config.RUN_SUMMARY_DIR / f"youtube-run{run.id}.json")
+    logger.info("📊 Run summary:\n  " + "\n  ".join(summary))
+
     db.close()
-    logger.info("✅ YouTube Job Finished.")
+    logger.info(f"✅ YouTube Job Finished. New: {new_records}, Updated: {updated_records}")
 
 if __name__ == "__main__":
-    run_youtube_job()
\ No newline at end of file
+    parser = add_checkpoint_arguments(argparse.ArgumentParser(description="Harvest YouTube metrics for the seed keywords."))
+    args = parser.parse_args()
+    run_youtube_job(resume=args.resume, freshness_hours=args.freshness_hours)
@@ -14,11 +14,13 @@ pip install -r requirements.txt
 echo "🗄️ Initializing database..."
 python -m app.database.init_db
 
-# 4. Run an initial data harvest
-
-echo "🚜 Running initial data harvest..."
-python -m jobs.update_forum
-python -m jobs.update_youtube
+# 4. Start the harvest scheduler
+# One process harvests YouTube, the forum and Google Trends concurrently, each
+# within its own rate limit and daily quota; the first cycle starts right away.
+echo "🚜 Starting harvest scheduler..."
+python -m jobs.scheduler &
+SCHEDULER_PID=$!
+trap 'kill $SCHEDULER_PID 2>/dev/null' EXIT
 
 # 5. Launch API
 echo "🌐 Starting REST API at http://0.0.0.0:8000"